@@ -0,0 +1,340 @@
+import os
+import glob
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from contour_epicycles_configuration import ContourEpicyclesConfiguration
+from variable_order_configuration import MultipleContourEpicyclesConfiguration
+from instrumentation_configuration import InstrumentationConfiguration, set_instrumentation
+
+
+class BaseBatchConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._paths_to_images = None
+		self._number_processes = None
+		self._results = None
+		self._elapsed_time = None
+
+	@property
+	def paths_to_images(self):
+		return self._paths_to_images
+
+	@property
+	def number_processes(self):
+		return self._number_processes
+
+	@property
+	def results(self):
+		return self._results
+
+	@property
+	def elapsed_time(self):
+		return self._elapsed_time
+
+	@staticmethod
+	def get_image_extensions():
+		image_extensions = (
+			".png",
+			".jpg",
+			".jpeg",
+			".bmp",
+			".tif",
+			".tiff")
+		return image_extensions
+
+	def get_paths_to_images(self, path_to_images):
+		if not isinstance(path_to_images, str):
+			raise ValueError("invalid type(path_to_images): {}".format(type(path_to_images)))
+		if os.path.isdir(path_to_images):
+			paths_to_images = sorted(
+				str(path_to_image)
+					for path_to_image in Path(path_to_images).iterdir()
+						if path_to_image.suffix.lower() in self.get_image_extensions())
+		else:
+			paths_to_images = sorted(
+				glob.glob(
+					path_to_images))
+		if len(paths_to_images) == 0:
+			raise ValueError("no images found at {}".format(path_to_images))
+		return paths_to_images
+
+	@staticmethod
+	def process_image(path_to_image, path_to_save_directory, views, threshold, index_at_contour, minimum_order, maximum_order, number_time_steps, method, parameterization, alpha_mode, maximum_pixels, selection, point_at_contour, simplification_tolerance, number_contour_points, energy_fraction, maximum_error, fps, figsize, extension, is_with_axes, is_with_collections, is_blit, is_stream, path_to_timings=None, profiled_stages=None, path_to_profile_directory=None, precision="double"):
+		## runs in a worker process; any failure is reported in the result instead of stopping the batch
+		import matplotlib.pyplot as plt
+		plt.switch_backend(
+			"Agg")
+		start_time = time.perf_counter()
+		result = {
+			"path-to-image" : path_to_image,
+			"is-success" : True,
+			"error" : None,
+			"maximum-order" : None,
+			"timings" : None}
+		## each worker records its own stages; the json lines file is shared by appending one line per record
+		if (path_to_timings is not None) or (profiled_stages is not None):
+			instrumentation = InstrumentationConfiguration()
+			instrumentation.initialize(
+				sinks=None if path_to_timings is None else [instrumentation.get_json_lines_sink(path_to_file=path_to_timings)],
+				profiled_stages=profiled_stages,
+				path_to_profile_directory=path_to_profile_directory)
+		else:
+			instrumentation = None
+		set_instrumentation(
+			instrumentation)
+		try:
+			if any(view in ("contour", "dft", "epicycles") for view in views):
+				contour_epicycle = ContourEpicyclesConfiguration()
+				contour_epicycle.initialize(
+					path_to_image=path_to_image,
+					threshold=threshold,
+					index_at_contour=index_at_contour,
+					maximum_order=maximum_order,
+					number_time_steps=number_time_steps,
+					method=method,
+					parameterization=parameterization,
+					alpha_mode=alpha_mode,
+					maximum_pixels=maximum_pixels,
+					selection=selection,
+					point_at_contour=point_at_contour,
+					simplification_tolerance=simplification_tolerance,
+					number_contour_points=number_contour_points,
+					energy_fraction=energy_fraction,
+					maximum_error=maximum_error,
+					precision=precision)
+				result["maximum-order"] = contour_epicycle.maximum_order
+				contour_epicycle.update_save_directory(
+					path_to_save_directory=path_to_save_directory)
+				if "contour" in views:
+					contour_epicycle.view_image(
+						is_show_contour=True,
+						is_with_axes=is_with_axes,
+						figsize=figsize,
+						is_save=True)
+				if "dft" in views:
+					contour_epicycle.view_image(
+						is_show_contour=True,
+						is_show_dft=True,
+						is_with_axes=is_with_axes,
+						figsize=figsize,
+						is_save=True)
+				if "epicycles" in views:
+					contour_epicycle.view_epicycles(
+						fps=fps,
+						is_show_contour=True,
+						is_show_dft=True,
+						is_with_axes=is_with_axes,
+						figsize=figsize,
+						is_save=True,
+						extension=extension,
+						is_with_collections=is_with_collections,
+						is_blit=is_blit,
+						is_stream=is_stream)
+			if "variable-order" in views:
+				multiple_contour_epicycles = MultipleContourEpicyclesConfiguration()
+				multiple_contour_epicycles.initialize(
+					path_to_image=path_to_image,
+					minimum_order=minimum_order,
+					maximum_order=maximum_order,
+					number_time_steps=number_time_steps,
+					threshold=threshold,
+					index_at_contour=index_at_contour,
+					method=method,
+					parameterization=parameterization,
+					alpha_mode=alpha_mode,
+					maximum_pixels=maximum_pixels,
+					selection=selection,
+					point_at_contour=point_at_contour,
+					simplification_tolerance=simplification_tolerance,
+					number_contour_points=number_contour_points,
+					precision=precision)
+				multiple_contour_epicycles.update_save_directory(
+					path_to_save_directory=path_to_save_directory)
+				multiple_contour_epicycles.view_variable_order(
+					fps=fps,
+					is_show_contour=True,
+					is_with_axes=is_with_axes,
+					figsize=figsize,
+					is_save=True,
+					extension=extension,
+					is_blit=is_blit,
+					is_stream=is_stream)
+		except Exception:
+			result["is-success"] = False
+			result["error"] = traceback.format_exc()
+		finally:
+			set_instrumentation(
+				None)
+		if instrumentation is not None:
+			result["timings"] = instrumentation.get_summary()
+		result["duration"] = time.perf_counter() - start_time
+		return result
+
+	@staticmethod
+	def get_failed_result(path_to_image):
+		## called while handling the exception that failed the image
+		failed_result = {
+			"path-to-image" : path_to_image,
+			"is-success" : False,
+			"error" : traceback.format_exc(),
+			"maximum-order" : None,
+			"timings" : None,
+			"duration" : float("nan")}
+		return failed_result
+
+	def get_summary(self):
+		if self.results is None:
+			raise ValueError("results are not initialized")
+		number_images = len(
+			self.results)
+		number_successes = sum(
+			result["is-success"]
+				for result in self.results)
+		if self.elapsed_time > 0:
+			images_per_minute = 60 * number_successes / self.elapsed_time
+		else:
+			images_per_minute = float("nan")
+		summary = {
+			"number-images" : number_images,
+			"number-successes" : number_successes,
+			"number-failures" : number_images - number_successes,
+			"number-processes" : self.number_processes,
+			"elapsed-time" : self.elapsed_time,
+			"images-per-minute" : images_per_minute}
+		return summary
+
+	def get_stage_durations(self):
+		## total time by stage over every instrumented image, largest first
+		if self.results is None:
+			raise ValueError("results are not initialized")
+		stage_durations = dict()
+		for result in self.results:
+			if result["timings"] is None:
+				continue
+			for stage, stage_summary in result["timings"].items():
+				stage_duration = stage_durations.setdefault(
+					stage,
+					{
+						"number-calls" : 0,
+						"total-duration" : 0.0})
+				stage_duration["number-calls"] += stage_summary["number-calls"]
+				stage_duration["total-duration"] += stage_summary["total-duration"]
+		stage_durations = dict(
+			sorted(
+				stage_durations.items(),
+				key=lambda item : item[1]["total-duration"],
+				reverse=True))
+		return stage_durations
+
+class BatchConfiguration(BaseBatchConfiguration):
+
+	def __init__(self):
+		super().__init__()
+
+	def initialize(self, path_to_images, number_processes=None):
+		paths_to_images = self.get_paths_to_images(
+			path_to_images=path_to_images)
+		if number_processes is None:
+			number_processes = os.cpu_count()
+		if not isinstance(number_processes, int):
+			raise ValueError("invalid type(number_processes): {}".format(type(number_processes)))
+		if number_processes <= 0:
+			raise ValueError("invalid number_processes: {}".format(number_processes))
+		self._paths_to_images = paths_to_images
+		self._number_processes = number_processes
+
+	def run(self, path_to_save_directory, views=("epicycles",), threshold=0.5, index_at_contour=0, minimum_order=1, maximum_order=100, number_time_steps=1080, method="fft", parameterization="index", alpha_mode="mean", maximum_pixels=None, selection="index", point_at_contour=None, simplification_tolerance=None, number_contour_points=None, energy_fraction=None, maximum_error=None, fps=60, figsize=(12, 7), extension=".mp4", is_with_axes=True, is_with_collections=True, is_blit=True, is_stream=True, path_to_timings=None, profiled_stages=None, path_to_profile_directory=None, precision="double"):
+		if not isinstance(path_to_save_directory, str):
+			raise ValueError("invalid type(path_to_save_directory): {}".format(type(path_to_save_directory)))
+		valid_views = (
+			"contour",
+			"dft",
+			"epicycles",
+			"variable-order")
+		for view in views:
+			if view not in valid_views:
+				raise ValueError("invalid view: {}".format(view))
+		arguments = (
+			path_to_save_directory,
+			tuple(views),
+			threshold,
+			index_at_contour,
+			minimum_order,
+			maximum_order,
+			number_time_steps,
+			method,
+			parameterization,
+			alpha_mode,
+			maximum_pixels,
+			selection,
+			point_at_contour,
+			simplification_tolerance,
+			number_contour_points,
+			energy_fraction,
+			maximum_error,
+			fps,
+			figsize,
+			extension,
+			is_with_axes,
+			is_with_collections,
+			is_blit,
+			is_stream,
+			path_to_timings,
+			profiled_stages,
+			path_to_profile_directory,
+			precision)
+		start_time = time.perf_counter()
+		results_by_path = dict()
+		paths_to_interrupted_images = list()
+		with ProcessPoolExecutor(max_workers=self.number_processes) as executor:
+			futures = [
+				executor.submit(
+					self.process_image,
+					path_to_image,
+					*arguments)
+						for path_to_image in self.paths_to_images]
+			for path_to_image, future in zip(self.paths_to_images, futures):
+				try:
+					results_by_path[path_to_image] = future.result()
+				except BrokenProcessPool:
+					paths_to_interrupted_images.append(
+						path_to_image)
+				except Exception:
+					results_by_path[path_to_image] = self.get_failed_result(
+						path_to_image=path_to_image)
+		## a worker that dies outright (e.g. killed for memory) breaks the shared pool for every image
+		## still pending; those are rerun with one pool per image, so only the image that kills its
+		## own worker again is marked as failed
+		for index_at_chunk in range(0, len(paths_to_interrupted_images), self.number_processes):
+			paths_to_chunk_images = paths_to_interrupted_images[index_at_chunk:index_at_chunk + self.number_processes]
+			executors = [
+				ProcessPoolExecutor(max_workers=1)
+					for _ in paths_to_chunk_images]
+			try:
+				futures = [
+					executor.submit(
+						self.process_image,
+						path_to_image,
+						*arguments)
+							for executor, path_to_image in zip(executors, paths_to_chunk_images)]
+				for path_to_image, future in zip(paths_to_chunk_images, futures):
+					try:
+						results_by_path[path_to_image] = future.result()
+					except Exception:
+						results_by_path[path_to_image] = self.get_failed_result(
+							path_to_image=path_to_image)
+			finally:
+				for executor in executors:
+					executor.shutdown()
+		results = [
+			results_by_path[path_to_image]
+				for path_to_image in self.paths_to_images]
+		self._results = results
+		self._elapsed_time = time.perf_counter() - start_time
+		return results
+
+##
@@ -0,0 +1,66 @@
+from pathlib import Path
+import numpy as np
+from contour_epicycles_configuration import ContourEpicyclesConfiguration
+
+
+path_to_data_directory = Path(__file__).resolve().parent.parent / "data"
+paths_to_images = sorted(
+	str(path_to_image)
+		for path_to_image in path_to_data_directory.glob("*.png"))
+
+parameterizations = (
+	"index",
+	"arc-length")
+
+## root-mean-square reconstruction error as a fraction of the diagonal of the bounding box
+relative_tolerance = 0.005
+maximum_order = 300
+number_time_steps = 1080
+
+
+def get_order_at_tolerance(path_to_image, parameterization):
+	contour_epicycle = ContourEpicyclesConfiguration()
+	contour_epicycle.initialize_contour(
+		path_to_image=path_to_image,
+		threshold=0.5,
+		index_at_contour=0,
+		parameterization=parameterization)
+	contour_epicycle.initialize_t()
+	contour_epicycle.initialize_orders(
+		maximum_order=maximum_order)
+	contour_epicycle.initialize_fourier_coefficients(
+		method="polyline")
+	contour_epicycle.update_discrete_fourier_transform_settings(
+		number_time_steps=number_time_steps)
+	reconstruction_errors = contour_epicycle.get_reconstruction_errors()
+	diagonal = np.hypot(
+		np.ptp(contour_epicycle.contour.x),
+		np.ptp(contour_epicycle.contour.y))
+	is_within_tolerance = (reconstruction_errors <= relative_tolerance * diagonal)
+	if np.any(is_within_tolerance):
+		order_at_tolerance = int(
+			np.argmax(
+				is_within_tolerance))
+	else:
+		order_at_tolerance = None
+	return order_at_tolerance
+
+
+if __name__ == "__main__":
+
+	print("{:<16}{:>12}{:>12}".format("image", *parameterizations))
+	for path_to_image in paths_to_images:
+		orders_at_tolerance = list()
+		for parameterization in parameterizations:
+			order_at_tolerance = get_order_at_tolerance(
+				path_to_image=path_to_image,
+				parameterization=parameterization)
+			if order_at_tolerance is None:
+				orders_at_tolerance.append(
+					"> {}".format(maximum_order))
+			else:
+				orders_at_tolerance.append(
+					str(order_at_tolerance))
+		print("{:<16}{:>12}{:>12}".format(Path(path_to_image).stem, *orders_at_tolerance))
+
+##
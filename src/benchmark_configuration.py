@@ -0,0 +1,395 @@
+import os
+import gc
+import sys
+import json
+import time
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+from contour_epicycles_configuration import ContourEpicyclesConfiguration
+from batch_configuration import BatchConfiguration
+
+
+class BaseBenchmarkConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._paths_to_images = None
+		self._maximum_orders = None
+		self._numbers_time_steps = None
+		self._stages = None
+		self._results = None
+
+	@property
+	def paths_to_images(self):
+		return self._paths_to_images
+
+	@property
+	def maximum_orders(self):
+		return self._maximum_orders
+
+	@property
+	def numbers_time_steps(self):
+		return self._numbers_time_steps
+
+	@property
+	def stages(self):
+		return self._stages
+
+	@property
+	def results(self):
+		return self._results
+
+	@staticmethod
+	def get_stages():
+		stages = (
+			"contour",
+			"fourier-coefficients",
+			"discrete-fourier-transform",
+			"render")
+		return stages
+
+	@staticmethod
+	def get_metric_names():
+		## a larger value is a regression for every metric except frames-per-second
+		metric_names = (
+			"wall-time",
+			"peak-memory",
+			"frames-per-second")
+		return metric_names
+
+	@staticmethod
+	def get_versions():
+		versions = {
+			"python" : platform.python_version(),
+			"numpy" : np.__version__}
+		for module_name in ("scipy", "matplotlib", "skimage", "PIL"):
+			try:
+				module = __import__(
+					module_name)
+				versions[module_name] = module.__version__
+			except ImportError:
+				versions[module_name] = None
+		return versions
+
+	@staticmethod
+	def measure(function, number_repeats):
+		## the fastest of the timed repeats is the least disturbed by the rest of the machine;
+		## peak memory comes from one more run under tracemalloc, which would otherwise slow the timed runs
+		if not isinstance(number_repeats, int):
+			raise ValueError("invalid type(number_repeats): {}".format(type(number_repeats)))
+		if number_repeats <= 0:
+			raise ValueError("invalid number_repeats: {}".format(number_repeats))
+		wall_times = list()
+		for _ in range(number_repeats):
+			gc.collect()
+			start_time = time.perf_counter()
+			function()
+			wall_times.append(
+				time.perf_counter() - start_time)
+		gc.collect()
+		tracemalloc.start()
+		try:
+			function()
+			_, peak_memory = tracemalloc.get_traced_memory()
+		finally:
+			tracemalloc.stop()
+		measurement = {
+			"wall-time" : min(wall_times),
+			"wall-times" : wall_times,
+			"peak-memory" : peak_memory}
+		return measurement
+
+	@staticmethod
+	def get_record_key(record):
+		record_key = (
+			os.path.basename(record["path-to-image"]),
+			record["stage"],
+			record["maximum-order"],
+			record["number-time-steps"])
+		return record_key
+
+	@staticmethod
+	def get_contour_epicycles(contour_epicycles, maximum_order=None):
+		## stages after the contour share the extracted contour instead of decoding the image again
+		modified_contour_epicycles = ContourEpicyclesConfiguration()
+		modified_contour_epicycles.initialize_visual_settings()
+		modified_contour_epicycles._contour = contour_epicycles.contour
+		modified_contour_epicycles._tau = contour_epicycles.tau
+		modified_contour_epicycles._t = contour_epicycles.t
+		if maximum_order is not None:
+			modified_contour_epicycles.initialize_orders(
+				maximum_order=maximum_order)
+		return modified_contour_epicycles
+
+	def get_record(self, contour_epicycles, stage, measurement, maximum_order=None, number_time_steps=None):
+		record = {
+			"path-to-image" : contour_epicycles.contour.path_to_image,
+			"stage" : stage,
+			"maximum-order" : maximum_order,
+			"number-time-steps" : number_time_steps,
+			"number-contour-points" : int(
+				contour_epicycles.contour.z.size),
+			"frames-per-second" : None}
+		record.update(
+			measurement)
+		if stage == "render":
+			record["frames-per-second"] = number_time_steps / measurement["wall-time"]
+		return record
+
+	def get_records_by_image(self, path_to_image, threshold, index_at_contour, coefficient_method, dft_method, fps, number_repeats, number_render_repeats, is_verbose):
+		records = list()
+
+		def run_stage(stage, function, number_repeats, contour_epicycles, maximum_order=None, number_time_steps=None):
+			## stages that are not benchmarked still run once when a later stage depends on them
+			if stage in self.stages:
+				measurement = self.measure(
+					function=function,
+					number_repeats=number_repeats)
+				record = self.get_record(
+					contour_epicycles=contour_epicycles,
+					stage=stage,
+					measurement=measurement,
+					maximum_order=maximum_order,
+					number_time_steps=number_time_steps)
+				records.append(
+					record)
+				if is_verbose:
+					print(self.get_record_line(
+						record=record))
+			else:
+				function()
+
+		contour_epicycles = ContourEpicyclesConfiguration()
+		contour_epicycles.initialize_visual_settings()
+		run_stage(
+			stage="contour",
+			function=lambda : contour_epicycles.initialize_contour(
+				path_to_image=path_to_image,
+				threshold=threshold,
+				index_at_contour=index_at_contour,
+				is_cache_contour=False),
+			number_repeats=number_repeats,
+			contour_epicycles=contour_epicycles)
+		contour_epicycles.initialize_t()
+		for maximum_order in self.maximum_orders:
+			order_epicycles = self.get_contour_epicycles(
+				contour_epicycles=contour_epicycles,
+				maximum_order=maximum_order)
+			run_stage(
+				stage="fourier-coefficients",
+				function=lambda : order_epicycles.initialize_fourier_coefficients(
+					method=coefficient_method,
+					is_cache=False),
+				number_repeats=number_repeats,
+				contour_epicycles=order_epicycles,
+				maximum_order=maximum_order)
+			for number_time_steps in self.numbers_time_steps:
+				run_stage(
+					stage="discrete-fourier-transform",
+					function=lambda : order_epicycles.initialize_discrete_fourier_transform(
+						number_time_steps=number_time_steps,
+						method=dft_method,
+						is_cache=False),
+					number_repeats=number_repeats,
+					contour_epicycles=order_epicycles,
+					maximum_order=maximum_order,
+					number_time_steps=number_time_steps)
+				if "render" in self.stages:
+					## frames per second covers the whole call: figure setup, drawing and encoding
+					with tempfile.TemporaryDirectory() as path_to_save_directory:
+						order_epicycles.update_save_directory(
+							path_to_save_directory=os.path.join(
+								path_to_save_directory,
+								""))
+						run_stage(
+							stage="render",
+							function=lambda : order_epicycles.view_epicycles(
+								fps=fps,
+								is_show_contour=True,
+								is_show_dft=True,
+								is_save=True,
+								is_with_collections=True,
+								is_blit=True,
+								is_stream=True),
+							number_repeats=number_render_repeats,
+							contour_epicycles=order_epicycles,
+							maximum_order=maximum_order,
+							number_time_steps=number_time_steps)
+		return records
+
+	@staticmethod
+	def get_record_line(record):
+		if record["frames-per-second"] is None:
+			frames_per_second = ""
+		else:
+			frames_per_second = "{:>8.1f} fps".format(
+				record["frames-per-second"])
+		record_line = "{:<16}{:<28}{:>6}{:>7}{:>11.4f} s{:>10.1f} MB{}".format(
+			os.path.basename(record["path-to-image"]),
+			record["stage"],
+			"" if record["maximum-order"] is None else record["maximum-order"],
+			"" if record["number-time-steps"] is None else record["number-time-steps"],
+			record["wall-time"],
+			record["peak-memory"] / 2**20,
+			frames_per_second)
+		return record_line
+
+	def save_results(self, path_to_file):
+		if self.results is None:
+			raise ValueError("results are not initialized")
+		if not isinstance(path_to_file, str):
+			raise ValueError("invalid type(path_to_file): {}".format(type(path_to_file)))
+		with open(path_to_file, "w") as f:
+			json.dump(
+				self.results,
+				f,
+				indent=1)
+
+	@staticmethod
+	def load_results(path_to_file):
+		if not isinstance(path_to_file, str):
+			raise ValueError("invalid type(path_to_file): {}".format(type(path_to_file)))
+		with open(path_to_file, "r") as f:
+			results = json.load(
+				f)
+		return results
+
+	def get_comparison(self, baseline_results, candidate_results, tolerance=0.1, minimum_wall_time=1e-3):
+		## ratios are candidate over baseline; wall times below minimum_wall_time are too noisy to flag
+		if not isinstance(tolerance, (int, float)):
+			raise ValueError("invalid type(tolerance): {}".format(type(tolerance)))
+		if tolerance < 0:
+			raise ValueError("invalid tolerance: {}".format(tolerance))
+		baseline_records = {
+			self.get_record_key(
+				record=record) : record
+					for record in baseline_results["records"]}
+		comparisons = list()
+		number_unmatched_records = 0
+		for candidate_record in candidate_results["records"]:
+			record_key = self.get_record_key(
+				record=candidate_record)
+			if record_key not in baseline_records:
+				number_unmatched_records += 1
+				continue
+			baseline_record = baseline_records[record_key]
+			comparison = {
+				"path-to-image" : candidate_record["path-to-image"],
+				"stage" : candidate_record["stage"],
+				"maximum-order" : candidate_record["maximum-order"],
+				"number-time-steps" : candidate_record["number-time-steps"],
+				"regressions" : list()}
+			for metric_name in self.get_metric_names():
+				baseline_value = baseline_record[metric_name]
+				candidate_value = candidate_record[metric_name]
+				if (baseline_value is None) or (candidate_value is None) or (baseline_value == 0):
+					ratio = None
+				else:
+					ratio = candidate_value / baseline_value
+				comparison["{}-ratio".format(metric_name)] = ratio
+				if ratio is None:
+					continue
+				if metric_name == "frames-per-second":
+					is_regression = (ratio < 1 / (1 + tolerance))
+				elif metric_name == "wall-time":
+					is_regression = (ratio > 1 + tolerance) and (candidate_value - baseline_value > minimum_wall_time)
+				else:
+					is_regression = (ratio > 1 + tolerance)
+				if is_regression:
+					comparison["regressions"].append(
+						metric_name)
+			comparison["is-regression"] = (len(comparison["regressions"]) > 0)
+			comparisons.append(
+				comparison)
+		## a differing machine, library version or method explains a change as well as the code would
+		metadata_differences = [
+			name
+				for name in ("platform", "number-cores", "versions", "threshold", "index-at-contour", "coefficient-method", "dft-method", "fps")
+					if baseline_results["metadata"].get(name) != candidate_results["metadata"].get(name)]
+		comparison_summary = {
+			"tolerance" : tolerance,
+			"metadata-differences" : metadata_differences,
+			"minimum-wall-time" : minimum_wall_time,
+			"number-comparisons" : len(comparisons),
+			"number-regressions" : sum(
+				comparison["is-regression"]
+					for comparison in comparisons),
+			"number-unmatched-records" : number_unmatched_records,
+			"comparisons" : comparisons}
+		return comparison_summary
+
+class BenchmarkConfiguration(BaseBenchmarkConfiguration):
+
+	def __init__(self):
+		super().__init__()
+
+	def initialize(self, path_to_images, maximum_orders=(10, 100), numbers_time_steps=(100, 500), stages=None):
+		batch = BatchConfiguration()
+		paths_to_images = batch.get_paths_to_images(
+			path_to_images=path_to_images)
+		if stages is None:
+			stages = self.get_stages()
+		for stage in stages:
+			if stage not in self.get_stages():
+				raise ValueError("invalid stage: {}".format(stage))
+		for maximum_order in maximum_orders:
+			if not isinstance(maximum_order, int):
+				raise ValueError("invalid type(maximum_order): {}".format(type(maximum_order)))
+		for number_time_steps in numbers_time_steps:
+			if not isinstance(number_time_steps, int):
+				raise ValueError("invalid type(number_time_steps): {}".format(type(number_time_steps)))
+		self._paths_to_images = paths_to_images
+		self._maximum_orders = tuple(
+			maximum_orders)
+		self._numbers_time_steps = tuple(
+			numbers_time_steps)
+		self._stages = tuple(
+			stages)
+
+	def run(self, threshold=0.5, index_at_contour=0, coefficient_method="fft", dft_method="fft", fps=60, number_repeats=3, number_render_repeats=1, is_verbose=False):
+		if "render" in self.stages:
+			import matplotlib.pyplot as plt
+			plt.switch_backend(
+				"Agg")
+		start_time = time.perf_counter()
+		records = list()
+		for path_to_image in self.paths_to_images:
+			records.extend(
+				self.get_records_by_image(
+					path_to_image=path_to_image,
+					threshold=threshold,
+					index_at_contour=index_at_contour,
+					coefficient_method=coefficient_method,
+					dft_method=dft_method,
+					fps=fps,
+					number_repeats=number_repeats,
+					number_render_repeats=number_render_repeats,
+					is_verbose=is_verbose))
+		metadata = {
+			"date" : datetime.now(timezone.utc).isoformat(),
+			"platform" : platform.platform(),
+			"processor" : platform.processor(),
+			"number-cores" : os.cpu_count(),
+			"versions" : self.get_versions(),
+			"command" : " ".join(sys.argv),
+			"maximum-orders" : list(self.maximum_orders),
+			"numbers-time-steps" : list(self.numbers_time_steps),
+			"stages" : list(self.stages),
+			"threshold" : threshold,
+			"index-at-contour" : index_at_contour,
+			"coefficient-method" : coefficient_method,
+			"dft-method" : dft_method,
+			"fps" : fps,
+			"number-repeats" : number_repeats,
+			"number-render-repeats" : number_render_repeats,
+			"elapsed-time" : time.perf_counter() - start_time}
+		results = {
+			"metadata" : metadata,
+			"records" : records}
+		self._results = results
+		return results
+
+##
@@ -0,0 +1,276 @@
+import os
+import hashlib
+import tempfile
+from pathlib import Path
+import numpy as np
+
+
+class BaseCacheConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._path_to_cache_directory = None
+		self._maximum_size = None
+
+	@property
+	def path_to_cache_directory(self):
+		return self._path_to_cache_directory
+
+	@property
+	def maximum_size(self):
+		return self._maximum_size
+
+	@staticmethod
+	def get_default_cache_directory():
+		path_to_cache_directory = os.environ.get(
+			"CONTOUR_EPICYCLES_CACHE_DIRECTORY",
+			str(Path.home() / ".cache" / "contour_epicycles"))
+		return path_to_cache_directory
+
+	@staticmethod
+	def get_file_hash(path_to_file, chunk_size=2**20):
+		file_hash = hashlib.sha256()
+		with open(path_to_file, "rb") as f:
+			for chunk in iter(lambda : f.read(chunk_size), b""):
+				file_hash.update(
+					chunk)
+		return file_hash.hexdigest()
+
+	@staticmethod
+	def get_key(*components, **parameters):
+		key_hash = hashlib.sha256()
+		for component in components:
+			if isinstance(component, np.ndarray):
+				key_hash.update(
+					np.ascontiguousarray(component).tobytes())
+				key_hash.update(
+					str((component.dtype, component.shape)).encode())
+			else:
+				key_hash.update(
+					repr(component).encode())
+		for name in sorted(parameters.keys()):
+			key_hash.update(
+				"{}={!r};".format(name, parameters[name]).encode())
+		return key_hash.hexdigest()
+
+	def initialize_cache_directory(self, path_to_cache_directory, maximum_size):
+		if path_to_cache_directory is None:
+			path_to_cache_directory = self.get_default_cache_directory()
+		if not isinstance(path_to_cache_directory, str):
+			raise ValueError("invalid type(path_to_cache_directory): {}".format(type(path_to_cache_directory)))
+		if not isinstance(maximum_size, int):
+			raise ValueError("invalid type(maximum_size): {}".format(type(maximum_size)))
+		if maximum_size <= 0:
+			raise ValueError("invalid maximum_size: {}".format(maximum_size))
+		os.makedirs(
+			path_to_cache_directory,
+			exist_ok=True)
+		self._path_to_cache_directory = path_to_cache_directory
+		self._maximum_size = maximum_size
+
+	def get_path_to_entry(self, key, extension=".npy"):
+		path_to_entry = os.path.join(
+			self.path_to_cache_directory,
+			"{}{}".format(
+				key,
+				extension))
+		return path_to_entry
+
+	def load_entry(self, key, extension=".npy"):
+		path_to_entry = self.get_path_to_entry(
+			key=key,
+			extension=extension)
+		try:
+			if extension == ".npz":
+				with np.load(path_to_entry) as archive:
+					entry = {
+						name : archive[name]
+							for name in archive.files}
+			else:
+				entry = np.load(
+					path_to_entry)
+		except (FileNotFoundError, ValueError, OSError, EOFError):
+			return None
+		## the modification time records the most recent use for least-recently-used eviction
+		try:
+			os.utime(
+				path_to_entry)
+		except FileNotFoundError:
+			pass
+		return entry
+
+	def save_entry(self, key, entry, extension=".npy"):
+		path_to_entry = self.get_path_to_entry(
+			key=key,
+			extension=extension)
+		## write to a temporary file first so that concurrent readers never see a partial entry
+		file_descriptor, path_to_temporary_file = tempfile.mkstemp(
+			dir=self.path_to_cache_directory,
+			suffix=".tmp")
+		try:
+			with os.fdopen(file_descriptor, "wb") as f:
+				if extension == ".npz":
+					np.savez(
+						f,
+						**entry)
+				else:
+					np.save(
+						f,
+						entry)
+			os.replace(
+				path_to_temporary_file,
+				path_to_entry)
+		except BaseException:
+			if os.path.exists(path_to_temporary_file):
+				os.remove(
+					path_to_temporary_file)
+			raise
+		self.evict_entries()
+
+	def evict_entries(self):
+		## removes the least recently used entries until the cache fits within maximum_size
+		entries = list()
+		for path_to_entry in Path(self.path_to_cache_directory).iterdir():
+			if path_to_entry.suffix not in (".npy", ".npz"):
+				continue
+			try:
+				entry_stat = path_to_entry.stat()
+			except FileNotFoundError:
+				continue
+			entries.append((
+				entry_stat.st_mtime,
+				entry_stat.st_size,
+				path_to_entry))
+		total_size = sum(
+			size
+				for _, size, _ in entries)
+		for _, size, path_to_entry in sorted(entries, key=lambda entry : entry[0]):
+			if total_size <= self.maximum_size:
+				break
+			try:
+				path_to_entry.unlink()
+			except FileNotFoundError:
+				pass
+			total_size -= size
+
+	def clear(self):
+		for path_to_entry in Path(self.path_to_cache_directory).iterdir():
+			if path_to_entry.suffix in (".npy", ".npz"):
+				try:
+					path_to_entry.unlink()
+				except FileNotFoundError:
+					pass
+
+class ContourCacheConfiguration(BaseCacheConfiguration):
+
+	def __init__(self):
+		super().__init__()
+
+	def initialize(self, path_to_cache_directory=None, maximum_size=2**28):
+		if path_to_cache_directory is None:
+			path_to_cache_directory = os.path.join(
+				self.get_default_cache_directory(),
+				"contours")
+		self.initialize_cache_directory(
+			path_to_cache_directory=path_to_cache_directory,
+			maximum_size=maximum_size)
+
+	def get_contour_key(self, path_to_image, **parameters):
+		## the version is bumped whenever extraction changes, so that stale contours are never loaded
+		contour_key = self.get_key(
+			"contour",
+			2,
+			self.get_file_hash(
+				path_to_file=path_to_image),
+			**parameters)
+		return contour_key
+
+	def load_contour(self, contour_key):
+		contour = self.load_entry(
+			key=contour_key)
+		return contour
+
+	def save_contour(self, contour, contour_key):
+		self.save_entry(
+			key=contour_key,
+			entry=contour)
+
+class FourierCacheConfiguration(BaseCacheConfiguration):
+
+	def __init__(self):
+		super().__init__()
+
+	def initialize(self, path_to_cache_directory=None, maximum_size=2**28):
+		if path_to_cache_directory is None:
+			path_to_cache_directory = os.path.join(
+				self.get_default_cache_directory(),
+				"fourier")
+		self.initialize_cache_directory(
+			path_to_cache_directory=path_to_cache_directory,
+			maximum_size=maximum_size)
+
+	def get_fourier_coefficients_key(self, t, z, method):
+		## the order is left out of the key; one entry holds the highest order computed so far
+		fourier_coefficients_key = self.get_key(
+			"fourier-coefficients",
+			t,
+			z,
+			method=method)
+		return fourier_coefficients_key
+
+	def load_fourier_coefficients(self, t, z, method, maximum_order):
+		fourier_coefficients_key = self.get_fourier_coefficients_key(
+			t=t,
+			z=z,
+			method=method)
+		cached_coefficients = self.load_entry(
+			key=fourier_coefficients_key)
+		if cached_coefficients is None:
+			return None
+		## coefficients for orders -m, ..., m are the centered slice of those cached at a higher order
+		cached_maximum_order = (cached_coefficients.shape[0] - 1) // 2
+		if cached_maximum_order < maximum_order:
+			return None
+		fourier_coefficients = cached_coefficients[cached_maximum_order - maximum_order : cached_maximum_order + maximum_order + 1]
+		return fourier_coefficients
+
+	def save_fourier_coefficients(self, fourier_coefficients, t, z, method):
+		fourier_coefficients_key = self.get_fourier_coefficients_key(
+			t=t,
+			z=z,
+			method=method)
+		cached_coefficients = self.load_entry(
+			key=fourier_coefficients_key)
+		if (cached_coefficients is None) or (cached_coefficients.shape[0] < fourier_coefficients.shape[0]):
+			self.save_entry(
+				key=fourier_coefficients_key,
+				entry=fourier_coefficients)
+
+	def get_discrete_fourier_transform_key(self, fourier_coefficients, orders, number_time_steps):
+		## the coefficients already encode the contour samples and the engine that produced them
+		discrete_fourier_transform_key = self.get_key(
+			"discrete-fourier-transform",
+			fourier_coefficients,
+			orders,
+			number_time_steps=number_time_steps)
+		return discrete_fourier_transform_key
+
+	def load_discrete_fourier_transform(self, fourier_coefficients, orders, number_time_steps):
+		discrete_fourier_transform_key = self.get_discrete_fourier_transform_key(
+			fourier_coefficients=fourier_coefficients,
+			orders=orders,
+			number_time_steps=number_time_steps)
+		discrete_fourier_transform = self.load_entry(
+			key=discrete_fourier_transform_key)
+		return discrete_fourier_transform
+
+	def save_discrete_fourier_transform(self, discrete_fourier_transform, fourier_coefficients, orders, number_time_steps):
+		discrete_fourier_transform_key = self.get_discrete_fourier_transform_key(
+			fourier_coefficients=fourier_coefficients,
+			orders=orders,
+			number_time_steps=number_time_steps)
+		self.save_entry(
+			key=discrete_fourier_transform_key,
+			entry=discrete_fourier_transform)
+
+##
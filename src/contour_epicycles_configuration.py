@@ -1,13 +1,31 @@
 import numpy as np
-from scipy.integrate import quad
 from image_contour_configuration import ImageContourConfiguration
-from plotter_configuration import (
-	BasePlotterConfiguration,
-	ContourEpicyclesViewer)
+from cache_configuration import FourierCacheConfiguration
+from instrumentation_configuration import instrument_stage
+from plotter_base_configuration import BasePlotterConfiguration
 
 
 class BaseContourEpicyclesConfiguration(BasePlotterConfiguration):
 
+	## coefficients and curves are stored as contiguous complex arrays; the (n, 2) arrays of real and
+	## imaginary parts exposed by fourier_coefficients and discrete_fourier_transform are views into them
+	__slots__ = (
+		"_contour",
+		"_tau",
+		"_t",
+		"_t_interp",
+		"_number_circles",
+		"_maximum_order",
+		"_orders",
+		"_number_time_steps",
+		"_fourier_coefficients",
+		"_fourier_coefficient_method",
+		"_discrete_fourier_transform",
+		"_order_selection",
+		"_precision",
+		"_fourier_coefficient_settings",
+		"_discrete_fourier_transform_settings")
+
 	def __init__(self):
 		super().__init__()
 		self._contour = None
@@ -19,7 +37,12 @@ class BaseContourEpicyclesConfiguration(BasePlotterConfiguration):
 		self._orders = None
 		self._number_time_steps = None
 		self._fourier_coefficients = None
+		self._fourier_coefficient_method = None
 		self._discrete_fourier_transform = None
+		self._order_selection = None
+		self._precision = None
+		self._fourier_coefficient_settings = None
+		self._discrete_fourier_transform_settings = None
 
 	@property
 	def contour(self):
@@ -55,12 +78,71 @@ class BaseContourEpicyclesConfiguration(BasePlotterConfiguration):
 
 	@property
 	def fourier_coefficients(self):
+		return self.get_real_view(
+			self.complex_fourier_coefficients)
+
+	@property
+	def complex_fourier_coefficients(self):
+		## computed on first access from the settings of the last update, then kept until an input changes
+		if (self._fourier_coefficients is None) and (self._fourier_coefficient_settings is not None):
+			self.initialize_fourier_coefficients(
+				**self._fourier_coefficient_settings)
 		return self._fourier_coefficients
 	
+	@property
+	def fourier_coefficient_method(self):
+		return self._fourier_coefficient_method
+
 	@property
 	def discrete_fourier_transform(self):
+		return self.get_real_view(
+			self.complex_discrete_fourier_transform)
+
+	@property
+	def complex_discrete_fourier_transform(self):
+		if (self._discrete_fourier_transform is None) and (self._discrete_fourier_transform_settings is not None):
+			self.initialize_discrete_fourier_transform(
+				**self._discrete_fourier_transform_settings)
 		return self._discrete_fourier_transform
 
+	@property
+	def order_selection(self):
+		return self._order_selection
+
+	@property
+	def precision(self):
+		return self._precision
+
+	@staticmethod
+	def get_real_view(z):
+		## zero-copy (..., 2) array of the real and imaginary parts of a contiguous complex array
+		if z is None:
+			return None
+		real_view = z.view(
+			z.real.dtype).reshape(
+				z.shape + (2,))
+		return real_view
+
+	@staticmethod
+	def get_complex_array(real_view):
+		## inverse of get_real_view, e.g. for arrays of real and imaginary parts loaded from the cache
+		real_view = np.ascontiguousarray(
+			real_view)
+		z = real_view.view(
+			np.result_type(real_view.dtype, np.complex64)).reshape(
+				real_view.shape[:-1])
+		return z
+
+	@staticmethod
+	def get_dtype(precision):
+		mapping = {
+			"double" : np.complex128,
+			"single" : np.complex64}
+		if precision not in mapping.keys():
+			raise ValueError("invalid precision: {}".format(precision))
+		dtype = mapping[precision]
+		return dtype
+
 	def f(self, t):
 		x = np.interp(
 			t,
@@ -73,12 +155,14 @@ class BaseContourEpicyclesConfiguration(BasePlotterConfiguration):
 		z = x + 1j * y
 		return z
 
+	@instrument_stage("contour")
 	def initialize_contour(self, *args, **kwargs):
 		contour = ImageContourConfiguration()
 		contour.initialize(
 			*args,
 			**kwargs)
 		self._contour = contour
+		self.reset_fourier_coefficients()
 
 	def initialize_t(self):
 		tau = 2 * np.pi
@@ -88,6 +172,7 @@ class BaseContourEpicyclesConfiguration(BasePlotterConfiguration):
 			self.contour.z.size)
 		self._tau = tau
 		self._t = t
+		self.reset_fourier_coefficients()
 
 	def initialize_orders(self, maximum_order):
 		if not isinstance(maximum_order, (int, np.int64)):
@@ -103,8 +188,25 @@ class BaseContourEpicyclesConfiguration(BasePlotterConfiguration):
 		self._number_circles = number_circles
 		self._maximum_order = maximum_order
 		self._orders = orders
+		self.reset_fourier_coefficients()
+
+	def reset_fourier_coefficients(self):
+		## the coefficients depend on the contour, t, the orders and the precision, and the curve on the coefficients;
+		## both are computed again with their last settings when next accessed
+		self._fourier_coefficients = None
+		self._order_selection = None
+		self.reset_discrete_fourier_transform()
+
+	def reset_discrete_fourier_transform(self):
+		self._discrete_fourier_transform = None
 
-	def initialize_fourier_coefficients(self):
+	def evaluate(self):
+		## computes whatever is pending, e.g. before the configuration is sent to other processes
+		self.complex_fourier_coefficients
+		self.complex_discrete_fourier_transform
+
+	def get_fourier_coefficients_by_quad(self):
+		from scipy.integrate import quad
 
 		def integrand(t, f_component):
 			value = f_component(
@@ -125,65 +227,527 @@ class BaseContourEpicyclesConfiguration(BasePlotterConfiguration):
 					f_component=np.imag),
 				0,
 				self.tau)[0]
-			coefficient = [
-				real_component_at_coefficient,
-				imag_component_at_coefficient]
+			coefficient = real_component_at_coefficient + 1j * imag_component_at_coefficient
 			fourier_coefficients.append(
 				coefficient)
 		fourier_coefficients = np.array(
-			fourier_coefficients)
+			fourier_coefficients,
+			dtype=complex)
+		return fourier_coefficients
+
+	@staticmethod
+	def get_batched_fourier_coefficients_by_fft(z, orders):
+		## periodic trapezoidal rule over the uniform samples in each row of z (number_contours, number_points)
+		number_intervals = z.shape[1] - 1
+		## with more orders than samples, high orders would wrap onto low frequencies
+		if orders.size > number_intervals:
+			raise ValueError("invalid maximum_order for method='fft': {} orders from {} contour samples; use method='polyline' or more contour points".format(orders.size, number_intervals))
+		samples = np.copy(
+			z[:, :-1])
+		samples[:, 0] = (z[:, 0] + z[:, -1]) / 2
+		spectrum = np.fft.fft(
+			samples,
+			axis=1) / number_intervals
+		fourier_coefficients = spectrum[:, orders % number_intervals]
+		return fourier_coefficients
+
+	@classmethod
+	def get_batched_fourier_coefficients_by_polyline(cls, t, z, orders, tau, maximum_memory=2**27):
+		## exact integral of the piecewise-linear f in each row of z; integrating by parts twice gives
+		## tau c_n = [f e^{-int} / (-in)] + sum_j s_j (e^{-in t_{j+1}} - e^{-in t_j}) / n^2
+		## for n != 0, where s_j is the slope of f over the j-th segment; the kernel depends only on
+		## the shared t and orders, so every row is one row of a matrix product
+		dt = np.diff(
+			t)
+		dz = np.diff(
+			z,
+			axis=1)
+		is_degenerate = (dt == 0)
+		slopes = np.zeros(
+			dz.shape,
+			dtype=complex)
+		slopes[:, ~is_degenerate] = dz[:, ~is_degenerate] / dt[~is_degenerate]
+		weights = np.zeros(
+			z.shape,
+			dtype=complex)
+		weights[:, 1:] += slopes
+		weights[:, :-1] -= slopes
+		fourier_coefficients = np.full(
+			fill_value=np.nan,
+			shape=(z.shape[0], orders.size),
+			dtype=complex)
+		number_rows_per_chunk = cls.get_number_rows_per_chunk(
+			number_columns=t.size,
+			maximum_memory=maximum_memory)
+		for index_at_start in range(0, orders.size, number_rows_per_chunk):
+			index_at_stop = index_at_start + number_rows_per_chunk
+			chunk_orders = orders[index_at_start:index_at_stop]
+			is_zero = (chunk_orders == 0)
+			nonzero_orders = np.where(
+				is_zero,
+				1,
+				chunk_orders)
+			kernel = np.exp(
+				-1j * np.outer(
+					chunk_orders,
+					t))
+			boundary_terms = (z[:, -1:] * kernel[:, -1] - z[:, :1] * kernel[:, 0]) / (-1j * nonzero_orders)
+			segment_terms = (weights @ kernel.T) / nonzero_orders**2
+			fourier_coefficients[:, index_at_start:index_at_stop] = (boundary_terms + segment_terms) / tau
+			if np.any(is_zero):
+				fourier_coefficients[:, index_at_start:index_at_stop][:, is_zero] = np.sum(
+					dt * (z[:, :-1] + z[:, 1:]) / 2,
+					axis=1,
+					keepdims=True) / tau
+		return fourier_coefficients
+
+	def get_fourier_coefficients_by_fft(self):
+		fourier_coefficients = self.get_batched_fourier_coefficients_by_fft(
+			z=self.contour.z[np.newaxis, :],
+			orders=self.orders)[0]
+		return fourier_coefficients
+
+	def get_fourier_coefficients_by_polyline(self, maximum_memory=2**27):
+		fourier_coefficients = self.get_batched_fourier_coefficients_by_polyline(
+			t=self.t,
+			z=self.contour.z[np.newaxis, :],
+			orders=self.orders,
+			tau=self.tau,
+			maximum_memory=maximum_memory)[0]
+		return fourier_coefficients
+
+	def get_fourier_coefficients(self, method):
+		mapping = {
+			"quad" : self.get_fourier_coefficients_by_quad,
+			"fft" : self.get_fourier_coefficients_by_fft,
+			"polyline" : self.get_fourier_coefficients_by_polyline}
+		if method not in mapping.keys():
+			raise ValueError("invalid method: {}".format(method))
+		get_coefficients = mapping[method]
+		fourier_coefficients = get_coefficients()
+		return fourier_coefficients
+
+	def get_fourier_coefficients_drift(self, method, reference_method="quad"):
+		z = self.get_fourier_coefficients(
+			method=method)
+		reference_z = self.get_fourier_coefficients(
+			method=reference_method)
+		absolute_drifts = np.abs(
+			z - reference_z)
+		drift = {
+			"method" : method,
+			"reference-method" : reference_method,
+			"maximum-absolute-drift" : np.max(
+				absolute_drifts),
+			"mean-absolute-drift" : np.mean(
+				absolute_drifts),
+			"relative-drift" : np.linalg.norm(
+				z - reference_z) / np.linalg.norm(
+					reference_z),
+			"absolute-drift-by-order" : absolute_drifts}
+		return drift
+
+	@classmethod
+	def get_partial_sums(cls, complex_fourier_coefficients, orders, t_interp, maximum_memory=2**27):
+		## column k holds the reconstruction over |n| <= orders[k] at every t_interp; the contributions
+		## of each order are accumulated by one cumulative sum per chunk of time steps
+		z = complex_fourier_coefficients
+		index_at_zero = (z.size - 1) // 2
+		maximum_order = int(
+			np.max(
+				orders))
+		if maximum_order > index_at_zero:
+			raise ValueError("orders up to {} are not compatible with complex_fourier_coefficients up to order {}".format(maximum_order, index_at_zero))
+		n = np.arange(
+			1,
+			maximum_order + 1)
+		partial_sums = np.full(
+			fill_value=np.nan,
+			shape=(t_interp.size, orders.size),
+			dtype=complex)
+		number_rows_per_chunk = cls.get_number_rows_per_chunk(
+			number_columns=max(
+				1,
+				maximum_order),
+			maximum_memory=maximum_memory)
+		for index_at_start in range(0, t_interp.size, number_rows_per_chunk):
+			index_at_stop = index_at_start + number_rows_per_chunk
+			kernel = np.exp(
+				-1j * np.outer(
+					t_interp[index_at_start:index_at_stop],
+					n))
+			contributions = kernel * z[index_at_zero + n] + np.conj(kernel) * z[index_at_zero - n]
+			## the leading column of zeros is the contribution up to order 0
+			cumulative_contributions = np.zeros(
+				shape=(contributions.shape[0], maximum_order + 1),
+				dtype=complex)
+			np.cumsum(
+				contributions,
+				axis=1,
+				out=cumulative_contributions[:, 1:])
+			partial_sums[index_at_start:index_at_stop] = z[index_at_zero] + cumulative_contributions[:, orders]
+		return partial_sums
+
+	def get_reconstruction_deviations(self, partial_sums):
+		## distances between each reconstruction at t_interp and f(tau - t_interp); the synthesis kernel
+		## exp(-i n t) traces f backwards
+		reference = self.f(
+			self.tau - self.t_interp)
+		deviations = np.abs(
+			partial_sums - reference[:, np.newaxis])
+		return deviations
+
+	@staticmethod
+	def get_root_mean_square_errors(deviations):
+		## the last time step repeats the first and is left out of the mean
+		root_mean_square_errors = np.sqrt(
+			np.mean(
+				deviations[:-1]**2,
+				axis=0))
+		return root_mean_square_errors
+
+	def get_reconstruction_errors(self, maximum_memory=2**27):
+		## root-mean-square error of the partial sums over |n| <= m for m = 0, ..., maximum_order,
+		## measured on t_interp exactly as in the reconstruction metrics
+		if self.t_interp is None:
+			raise ValueError("t_interp is not initialized")
+		partial_sums = self.get_partial_sums(
+			complex_fourier_coefficients=self.complex_fourier_coefficients,
+			orders=np.arange(
+				self.maximum_order + 1),
+			t_interp=self.t_interp,
+			maximum_memory=maximum_memory)
+		deviations = self.get_reconstruction_deviations(
+			partial_sums=partial_sums)
+		reconstruction_errors = self.get_root_mean_square_errors(
+			deviations=deviations)
+		return reconstruction_errors
+
+	def get_energy_fractions(self):
+		## fraction of the energy of the centered curve retained by the orders |n| <= m for m = 0, ..., maximum_order;
+		## by parseval the total is the mean squared distance of the periodic samples from c_0
+		z = self.complex_fourier_coefficients
+		index_at_zero = self.maximum_order
+		total_energy = np.mean(
+			np.abs(self.contour.z[:-1] - z[index_at_zero])**2)
+		energies_by_order = np.abs(z[index_at_zero + 1:])**2 + np.abs(z[index_at_zero - 1::-1])**2
+		energy_fractions = np.concatenate([
+			[0],
+			np.cumsum(
+				energies_by_order)]) / total_energy
+		energy_fractions = np.minimum(
+			energy_fractions,
+			1)
+		return energy_fractions
+
+	def get_selected_order(self, energy_fraction=None, maximum_error=None):
+		## smallest order that meets the target; maximum_order when none does
+		if (energy_fraction is None) == (maximum_error is None):
+			raise ValueError("exactly one of the following inputs should be specified: 'energy_fraction', 'maximum_error'")
+		energy_fractions = self.get_energy_fractions()
+		reconstruction_errors = self.get_reconstruction_errors()
+		if energy_fraction is not None:
+			if not isinstance(energy_fraction, (int, float)):
+				raise ValueError("invalid type(energy_fraction): {}".format(type(energy_fraction)))
+			if not (0 < energy_fraction <= 1):
+				raise ValueError("invalid energy_fraction: {}".format(energy_fraction))
+			is_within_target = (energy_fractions >= energy_fraction)
+		else:
+			if not isinstance(maximum_error, (int, float)):
+				raise ValueError("invalid type(maximum_error): {}".format(type(maximum_error)))
+			if maximum_error <= 0:
+				raise ValueError("invalid maximum_error: {}".format(maximum_error))
+			is_within_target = (reconstruction_errors <= maximum_error)
+		is_converged = bool(
+			np.any(
+				is_within_target))
+		if is_converged:
+			selected_order = max(
+				1,
+				int(
+					np.argmax(
+						is_within_target)))
+		else:
+			selected_order = self.maximum_order
+		order_selection = {
+			"order" : selected_order,
+			"maximum-order" : self.maximum_order,
+			"energy-fraction" : energy_fraction,
+			"maximum-error" : maximum_error,
+			"is-converged" : is_converged,
+			"energy-fractions" : energy_fractions,
+			"reconstruction-errors" : reconstruction_errors}
+		return order_selection
+
+	@instrument_stage("selected-order")
+	def initialize_selected_order(self, energy_fraction=None, maximum_error=None):
+		## the coefficients at the selected order are the centered slice of those already computed
+		order_selection = self.get_selected_order(
+			energy_fraction=energy_fraction,
+			maximum_error=maximum_error)
+		index_at_zero = self.maximum_order
+		selected_order = order_selection["order"]
+		fourier_coefficients = self.complex_fourier_coefficients[index_at_zero - selected_order : index_at_zero + selected_order + 1]
+		self.initialize_orders(
+			maximum_order=selected_order)
 		self._fourier_coefficients = fourier_coefficients
+		self._order_selection = order_selection
 
-	def initialize_discrete_fourier_transform(self, number_time_steps):
-		if not isinstance(number_time_steps, int):
-			raise ValueError("invalid type(number_time_steps): {}".format(type(number_time_steps)))
-		if number_time_steps <= 2:
-			raise ValueError("invalid number_time_steps: {}".format(number_time_steps))
-		t_interp = np.linspace(
-			0,
-			self.tau,
-			number_time_steps)
-		z = self.fourier_coefficients[:, 0] + 1j * self.fourier_coefficients[:, 1]
+	def initialize_precision(self, precision="double"):
+		## "single" stores the coefficients and curves as complex64, which halves their memory
+		self.get_dtype(
+			precision=precision)
+		self._precision = precision
+		self.reset_fourier_coefficients()
+
+	def get_precision_dtype(self):
+		if self.precision is None:
+			return np.complex128
+		dtype = self.get_dtype(
+			precision=self.precision)
+		return dtype
+
+	def get_fourier_cache(self, path_to_cache_directory=None):
+		fourier_cache = FourierCacheConfiguration()
+		fourier_cache.initialize(
+			path_to_cache_directory=path_to_cache_directory)
+		return fourier_cache
+
+	def update_fourier_coefficient_settings(self, method="quad", is_cache=False, path_to_cache_directory=None):
+		## the coefficients are computed with these settings when they are first accessed
+		if method not in ("quad", "fft", "polyline"):
+			raise ValueError("invalid method: {}".format(method))
+		if not isinstance(is_cache, bool):
+			raise ValueError("invalid type(is_cache): {}".format(type(is_cache)))
+		fourier_coefficient_settings = {
+			"method" : method,
+			"is_cache" : is_cache,
+			"path_to_cache_directory" : path_to_cache_directory}
+		self.reset_fourier_coefficients()
+		self._fourier_coefficient_settings = fourier_coefficient_settings
+		self._fourier_coefficient_method = method
+
+	@instrument_stage("fourier-coefficients")
+	def initialize_fourier_coefficients(self, method="quad", is_cache=False, path_to_cache_directory=None):
+		self.update_fourier_coefficient_settings(
+			method=method,
+			is_cache=is_cache,
+			path_to_cache_directory=path_to_cache_directory)
+		fourier_coefficients = None
+		if is_cache:
+			fourier_cache = self.get_fourier_cache(
+				path_to_cache_directory=path_to_cache_directory)
+			fourier_coefficients = fourier_cache.load_fourier_coefficients(
+				t=self.t,
+				z=self.contour.z,
+				method=method,
+				maximum_order=self.maximum_order)
+			if fourier_coefficients is not None:
+				fourier_coefficients = self.get_complex_array(
+					fourier_coefficients)
+		if fourier_coefficients is None:
+			fourier_coefficients = self.get_fourier_coefficients(
+				method=method)
+			if is_cache:
+				fourier_cache.save_fourier_coefficients(
+					fourier_coefficients=self.get_real_view(
+						fourier_coefficients),
+					t=self.t,
+					z=self.contour.z,
+					method=method)
+		self._fourier_coefficients = fourier_coefficients.astype(
+			self.get_precision_dtype(),
+			copy=False)
+
+	@staticmethod
+	def get_number_rows_per_chunk(number_columns, maximum_memory, itemsize=16):
+		if not isinstance(maximum_memory, int):
+			raise ValueError("invalid type(maximum_memory): {}".format(type(maximum_memory)))
+		if maximum_memory <= 0:
+			raise ValueError("invalid maximum_memory: {}".format(maximum_memory))
+		number_rows_per_chunk = max(
+			1,
+			maximum_memory // (number_columns * itemsize))
+		return number_rows_per_chunk
+
+	def get_discrete_fourier_transform_by_loop(self, t_interp):
+		z = self.complex_fourier_coefficients
 		discrete_fourier_transform = list()
 		for t in t_interp:
 			kernel = np.exp(
 				-1j * self.orders * t)
 			dft = np.sum(
 				z * kernel[:])
-			real_component_at_dft = np.real(
-				dft)
-			imag_component_at_dft = np.imag(
-				dft)
-			dft_component = [
-				real_component_at_dft,
-				imag_component_at_dft]
 			discrete_fourier_transform.append(
-				dft_component)
+				dft)
 		discrete_fourier_transform = np.array(
-			discrete_fourier_transform)
+			discrete_fourier_transform,
+			dtype=complex)
+		return discrete_fourier_transform
+
+	def get_discrete_fourier_transform_by_matrix(self, t_interp, maximum_memory):
+		z = self.complex_fourier_coefficients
+		number_rows_per_chunk = self.get_number_rows_per_chunk(
+			number_columns=self.number_circles,
+			maximum_memory=maximum_memory)
+		discrete_fourier_transform = np.full(
+			fill_value=np.nan,
+			shape=t_interp.size,
+			dtype=complex)
+		for index_at_start in range(0, t_interp.size, number_rows_per_chunk):
+			index_at_stop = index_at_start + number_rows_per_chunk
+			kernel = np.exp(
+				-1j * np.outer(
+					t_interp[index_at_start:index_at_stop],
+					self.orders))
+			discrete_fourier_transform[index_at_start:index_at_stop] = kernel @ z
+		return discrete_fourier_transform
+
+	@staticmethod
+	def get_batched_discrete_fourier_transform_by_fft(fourier_coefficients, orders, t_interp):
+		## t_interp = linspace(0, tau, number_time_steps) is a uniform grid of period (number_time_steps - 1);
+		## orders that alias onto the same bin are summed, which is exact on this grid; one row per contour
+		number_intervals = t_interp.size - 1
+		padded_coefficients = np.zeros(
+			shape=(fourier_coefficients.shape[0], number_intervals),
+			dtype=complex)
+		np.add.at(
+			padded_coefficients,
+			(slice(None), orders % number_intervals),
+			fourier_coefficients)
+		dft = np.fft.fft(
+			padded_coefficients,
+			axis=1)
+		discrete_fourier_transform = np.empty(
+			shape=(fourier_coefficients.shape[0], t_interp.size),
+			dtype=complex)
+		discrete_fourier_transform[:, :-1] = dft
+		discrete_fourier_transform[:, -1] = dft[:, 0]
+		return discrete_fourier_transform
+
+	def get_discrete_fourier_transform_by_fft(self, t_interp):
+		discrete_fourier_transform = self.get_batched_discrete_fourier_transform_by_fft(
+			fourier_coefficients=self.complex_fourier_coefficients[np.newaxis, :],
+			orders=self.orders,
+			t_interp=t_interp)[0]
+		return discrete_fourier_transform
+
+	def get_t_interp(self, number_time_steps):
+		if not isinstance(number_time_steps, int):
+			raise ValueError("invalid type(number_time_steps): {}".format(type(number_time_steps)))
+		if number_time_steps <= 2:
+			raise ValueError("invalid number_time_steps: {}".format(number_time_steps))
+		t_interp = np.linspace(
+			0,
+			self.tau,
+			number_time_steps)
+		return t_interp
+
+	def update_discrete_fourier_transform_settings(self, number_time_steps, method="matrix", maximum_memory=2**27, is_cache=False, path_to_cache_directory=None):
+		## t_interp is set at once; the curve is computed with these settings when it is first accessed
+		if method not in ("loop", "matrix", "fft"):
+			raise ValueError("invalid method: {}".format(method))
+		if not isinstance(is_cache, bool):
+			raise ValueError("invalid type(is_cache): {}".format(type(is_cache)))
+		t_interp = self.get_t_interp(
+			number_time_steps=number_time_steps)
+		discrete_fourier_transform_settings = {
+			"number_time_steps" : number_time_steps,
+			"method" : method,
+			"maximum_memory" : maximum_memory,
+			"is_cache" : is_cache,
+			"path_to_cache_directory" : path_to_cache_directory}
+		self.reset_discrete_fourier_transform()
 		self._t_interp = t_interp
-		self._discrete_fourier_transform = discrete_fourier_transform
 		self._number_time_steps = number_time_steps
+		self._discrete_fourier_transform_settings = discrete_fourier_transform_settings
+
+	@instrument_stage("discrete-fourier-transform")
+	def initialize_discrete_fourier_transform(self, number_time_steps, method="matrix", maximum_memory=2**27, is_cache=False, path_to_cache_directory=None):
+		self.update_discrete_fourier_transform_settings(
+			number_time_steps=number_time_steps,
+			method=method,
+			maximum_memory=maximum_memory,
+			is_cache=is_cache,
+			path_to_cache_directory=path_to_cache_directory)
+		t_interp = self.t_interp
+		if is_cache:
+			fourier_cache = self.get_fourier_cache(
+				path_to_cache_directory=path_to_cache_directory)
+			discrete_fourier_transform = fourier_cache.load_discrete_fourier_transform(
+				fourier_coefficients=self.fourier_coefficients,
+				orders=self.orders,
+				number_time_steps=number_time_steps)
+			if discrete_fourier_transform is not None:
+				self._discrete_fourier_transform = self.get_complex_array(
+					discrete_fourier_transform)
+				return
+		if method == "loop":
+			discrete_fourier_transform = self.get_discrete_fourier_transform_by_loop(
+				t_interp=t_interp)
+		elif method == "matrix":
+			discrete_fourier_transform = self.get_discrete_fourier_transform_by_matrix(
+				t_interp=t_interp,
+				maximum_memory=maximum_memory)
+		elif method == "fft":
+			discrete_fourier_transform = self.get_discrete_fourier_transform_by_fft(
+				t_interp=t_interp)
+		discrete_fourier_transform = discrete_fourier_transform.astype(
+			self.get_precision_dtype(),
+			copy=False)
+		if is_cache:
+			fourier_cache.save_discrete_fourier_transform(
+				discrete_fourier_transform=self.get_real_view(
+					discrete_fourier_transform),
+				fourier_coefficients=self.fourier_coefficients,
+				orders=self.orders,
+				number_time_steps=number_time_steps)
+		self._discrete_fourier_transform = discrete_fourier_transform
 
 class ContourEpicyclesConfiguration(BaseContourEpicyclesConfiguration):
 
+	__slots__ = ()
+
 	def __init__(self):
 		super().__init__()
 
-	def initialize(self, path_to_image, threshold=0.5, index_at_contour=0, maximum_order=10, number_time_steps=500):
+	@instrument_stage("contour-epicycles")
+	def initialize(self, path_to_image, threshold=0.5, index_at_contour=0, maximum_order=10, number_time_steps=500, method="quad", parameterization="index", alpha_mode="mean", maximum_pixels=None, selection="index", point_at_contour=None, simplification_tolerance=None, number_contour_points=None, energy_fraction=None, maximum_error=None, precision="double", is_cache_contour=True, is_cache_fourier=True):
 		self.initialize_visual_settings()
 		self.initialize_contour(
 			path_to_image=path_to_image,
 			threshold=threshold,
-			index_at_contour=index_at_contour)
+			index_at_contour=index_at_contour,
+			parameterization=parameterization,
+			alpha_mode=alpha_mode,
+			maximum_pixels=maximum_pixels,
+			selection=selection,
+			point_at_contour=point_at_contour,
+			simplification_tolerance=simplification_tolerance,
+			number_contour_points=number_contour_points,
+			is_cache_contour=is_cache_contour)
 		self.initialize_t()
 		self.initialize_orders(
 			maximum_order=maximum_order)
-		self.initialize_fourier_coefficients()
-		self.initialize_discrete_fourier_transform(
-			number_time_steps=number_time_steps)
+		self.initialize_precision(
+			precision=precision)
+		## the coefficients and the curve are computed when first accessed, so that e.g. a plot
+		## of the contour alone never computes them
+		self.update_fourier_coefficient_settings(
+			method=method,
+			is_cache=is_cache_fourier)
+		self.update_discrete_fourier_transform_settings(
+			number_time_steps=number_time_steps,
+			is_cache=is_cache_fourier)
+		## maximum_order becomes an upper bound when the order is selected automatically,
+		## which needs the coefficients at once; errors are measured on t_interp
+		if (energy_fraction is not None) or (maximum_error is not None):
+			self.initialize_selected_order(
+				energy_fraction=energy_fraction,
+				maximum_error=maximum_error)
 
 	def view_image(self, is_show_contour=False, is_show_dft=False, is_with_axes=False, contour_color="darkorange", dft_color="steelblue", figsize=None, is_save=False):
+		from plotter_configuration import ContourEpicyclesViewer
 		plotter = ContourEpicyclesViewer()
 		plotter.initialize_visual_settings()
 		plotter.update_save_directory(
@@ -198,7 +762,8 @@ class ContourEpicyclesConfiguration(BaseContourEpicyclesConfiguration):
 			figsize=figsize,
 			is_save=is_save)
 
-	def view_epicycles(self, fps=60, is_show_contour=False, is_show_dft=False, is_with_axes=False, contour_color="steelblue", dft_color="limegreen", curve_color="darkorange", radius_color="silver", circle_color="black", number_thetas=100, figsize=None, is_save=False, extension=".mp4"):
+	def view_epicycles(self, fps=60, is_show_contour=False, is_show_dft=False, is_with_axes=False, contour_color="steelblue", dft_color="limegreen", curve_color="darkorange", radius_color="silver", circle_color="black", number_thetas=100, figsize=None, is_save=False, extension=".mp4", is_with_collections=False, is_blit=False, is_stream=False, codec=None, crf=None, pixel_format=None, number_processes=None):
+		from plotter_configuration import ContourEpicyclesViewer
 		plotter = ContourEpicyclesViewer()
 		plotter.initialize_visual_settings()
 		plotter.update_save_directory(
@@ -217,6 +782,13 @@ class ContourEpicyclesConfiguration(BaseContourEpicyclesConfiguration):
 			number_thetas=number_thetas,
 			figsize=figsize,
 			is_save=is_save,
-			extension=extension)
+			extension=extension,
+			is_with_collections=is_with_collections,
+			is_blit=is_blit,
+			is_stream=is_stream,
+			codec=codec,
+			crf=crf,
+			pixel_format=pixel_format,
+			number_processes=number_processes)
 
 ##
\ No newline at end of file
@@ -0,0 +1,269 @@
+import numpy as np
+from instrumentation_configuration import instrument_stage
+from image_contour_configuration import ImageContourConfiguration
+from contour_epicycles_configuration import (
+	ContourEpicyclesConfiguration,
+	BaseContourEpicyclesConfiguration)
+
+
+class BaseContourGroupConfiguration(BaseContourEpicyclesConfiguration):
+
+	__slots__ = (
+		"_contours",
+		"_number_contours",
+		"_group_fourier_coefficients",
+		"_group_discrete_fourier_transform",
+		"_multiple_contour_epicycles")
+
+	def __init__(self):
+		super().__init__()
+		self._contours = None
+		self._number_contours = None
+		self._group_fourier_coefficients = None
+		self._group_discrete_fourier_transform = None
+		self._multiple_contour_epicycles = None
+
+	@property
+	def contours(self):
+		return self._contours
+
+	@property
+	def number_contours(self):
+		return self._number_contours
+
+	@property
+	def group_fourier_coefficients(self):
+		return self.get_real_view(
+			self._group_fourier_coefficients)
+
+	@property
+	def group_discrete_fourier_transform(self):
+		return self.get_real_view(
+			self._group_discrete_fourier_transform)
+
+	@property
+	def complex_group_fourier_coefficients(self):
+		return self._group_fourier_coefficients
+
+	@property
+	def complex_group_discrete_fourier_transform(self):
+		return self._group_discrete_fourier_transform
+
+	@property
+	def multiple_contour_epicycles(self):
+		return self._multiple_contour_epicycles
+
+	@staticmethod
+	def f(*args, **kwargs):
+		raise ValueError("this method exists only for the parent class for the inheritance purposes")
+
+	@staticmethod
+	def initialize_t(*args, **kwargs):
+		raise ValueError("this method exists only for the parent class for the inheritance purposes")
+
+	@staticmethod
+	def initialize_fourier_coefficients(*args, **kwargs):
+		raise ValueError("this method exists only for the parent class for the inheritance purposes")
+
+	@staticmethod
+	def initialize_discrete_fourier_transform(*args, **kwargs):
+		raise ValueError("this method exists only for the parent class for the inheritance purposes")
+
+	def get_group_z(self):
+		## one row per contour; every contour has the same number of points
+		group_z = self.contour.z.reshape(
+			self.number_contours,
+			-1)
+		return group_z
+
+	@instrument_stage("contours")
+	def initialize_contours(self, path_to_image, threshold, indices_at_contours=None, minimum_number_points=100, number_contour_points=None, parameterization="index", simplification_tolerance=None, alpha_mode="mean", maximum_pixels=None):
+		image_contour = ImageContourConfiguration()
+		name = image_contour.get_name_from_path(
+			path_to_image=path_to_image)
+		raw_contours = image_contour.get_contours(
+			path_to_image=path_to_image,
+			threshold=threshold,
+			indices_at_contours=indices_at_contours,
+			minimum_number_points=minimum_number_points,
+			alpha_mode=alpha_mode,
+			maximum_pixels=maximum_pixels)
+		number_contours = len(
+			raw_contours)
+		if number_contour_points is None:
+			number_contour_points = max(
+				raw_contour.shape[0]
+					for raw_contour in raw_contours)
+		## every contour is resampled to the same number of points so that the group stacks into one array
+		x = np.empty(
+			shape=(number_contours, number_contour_points),
+			dtype=float)
+		y = np.empty(
+			shape=(number_contours, number_contour_points),
+			dtype=float)
+		contours = list()
+		for index_at_contour, raw_contour in enumerate(raw_contours):
+			x[index_at_contour], y[index_at_contour], simplification_report = image_contour.get_processed_contour(
+				contour=raw_contour,
+				parameterization=parameterization,
+				simplification_tolerance=simplification_tolerance,
+				number_contour_points=number_contour_points)
+			contour = ImageContourConfiguration()
+			contour._path_to_image = path_to_image
+			contour._name = name
+			contour._parameterization = parameterization
+			contour._simplification_report = simplification_report
+			contours.append(
+				contour)
+		## one shared offset keeps the contours in place relative to each other
+		image_contour.center_about_origin(
+			x=x.reshape(-1),
+			y=y.reshape(-1))
+		z = x + 1j * y
+		for index_at_contour, contour in enumerate(contours):
+			contour._z = z[index_at_contour]
+		## the union of all contours stands in for the single contour in axis limits and save names
+		group_contour = ImageContourConfiguration()
+		group_contour._path_to_image = path_to_image
+		group_contour._name = name
+		group_contour._parameterization = parameterization
+		group_contour._z = z.reshape(-1)
+		tau = 2 * np.pi
+		t = np.linspace(
+			0,
+			tau,
+			number_contour_points)
+		self._contour = group_contour
+		self._contours = contours
+		self._number_contours = number_contours
+		self._tau = tau
+		self._t = t
+
+	def get_group_fourier_coefficients_by_fft(self):
+		## the single-contour engines are batched over the rows of the group
+		z = self.get_batched_fourier_coefficients_by_fft(
+			z=self.get_group_z(),
+			orders=self.orders)
+		return z
+
+	def get_group_fourier_coefficients_by_polyline(self, maximum_memory=2**27):
+		z = self.get_batched_fourier_coefficients_by_polyline(
+			t=self.t,
+			z=self.get_group_z(),
+			orders=self.orders,
+			tau=self.tau,
+			maximum_memory=maximum_memory)
+		return z
+
+	def get_group_fourier_coefficients(self, method):
+		mapping = {
+			"fft" : self.get_group_fourier_coefficients_by_fft,
+			"polyline" : self.get_group_fourier_coefficients_by_polyline}
+		if method not in mapping.keys():
+			raise ValueError("invalid method: {}".format(method))
+		get_coefficients = mapping[method]
+		group_fourier_coefficients = get_coefficients()
+		return group_fourier_coefficients
+
+	@instrument_stage("group-fourier-coefficients")
+	def initialize_group_fourier_coefficients(self, method="fft"):
+		group_fourier_coefficients = self.get_group_fourier_coefficients(
+			method=method)
+		self._group_fourier_coefficients = np.ascontiguousarray(
+			group_fourier_coefficients,
+			dtype=self.get_precision_dtype())
+		self._fourier_coefficient_method = method
+
+	@instrument_stage("group-discrete-fourier-transform")
+	def initialize_group_discrete_fourier_transform(self, number_time_steps):
+		t_interp = self.get_t_interp(
+			number_time_steps=number_time_steps)
+		group_discrete_fourier_transform = self.get_batched_discrete_fourier_transform_by_fft(
+			fourier_coefficients=self.complex_group_fourier_coefficients,
+			orders=self.orders,
+			t_interp=t_interp).astype(
+				self.get_precision_dtype(),
+				copy=False)
+		self._t_interp = t_interp
+		self._group_discrete_fourier_transform = group_discrete_fourier_transform
+		self._number_time_steps = number_time_steps
+
+	def initialize_multiple_contour_epicycles(self):
+		## each contour keeps the usual single-contour interface over views into the group arrays
+		multiple_contour_epicycles = list()
+		for index_at_contour, contour in enumerate(self.contours):
+			contour_epicycles = ContourEpicyclesConfiguration()
+			contour_epicycles.initialize_visual_settings()
+			contour_epicycles._contour = contour
+			contour_epicycles._tau = self.tau
+			contour_epicycles._t = self.t
+			contour_epicycles.initialize_orders(
+				maximum_order=self.maximum_order)
+			contour_epicycles._precision = self.precision
+			contour_epicycles._fourier_coefficients = self.complex_group_fourier_coefficients[index_at_contour]
+			contour_epicycles._fourier_coefficient_method = self.fourier_coefficient_method
+			contour_epicycles._t_interp = self.t_interp
+			contour_epicycles._discrete_fourier_transform = self.complex_group_discrete_fourier_transform[index_at_contour]
+			contour_epicycles._number_time_steps = self.number_time_steps
+			multiple_contour_epicycles.append(
+				contour_epicycles)
+		self._multiple_contour_epicycles = multiple_contour_epicycles
+
+class ContourGroupConfiguration(BaseContourGroupConfiguration):
+
+	__slots__ = ()
+
+	def __init__(self):
+		super().__init__()
+
+	@instrument_stage("contour-group")
+	def initialize(self, path_to_image, threshold=0.5, indices_at_contours=None, minimum_number_points=100, maximum_order=10, number_time_steps=500, number_contour_points=None, method="fft", parameterization="index", simplification_tolerance=None, alpha_mode="mean", maximum_pixels=None, precision="double"):
+		self.initialize_visual_settings()
+		self.initialize_contours(
+			path_to_image=path_to_image,
+			threshold=threshold,
+			indices_at_contours=indices_at_contours,
+			minimum_number_points=minimum_number_points,
+			number_contour_points=number_contour_points,
+			parameterization=parameterization,
+			simplification_tolerance=simplification_tolerance,
+			alpha_mode=alpha_mode,
+			maximum_pixels=maximum_pixels)
+		self.initialize_orders(
+			maximum_order=maximum_order)
+		self.initialize_precision(
+			precision=precision)
+		self.initialize_group_fourier_coefficients(
+			method=method)
+		self.initialize_group_discrete_fourier_transform(
+			number_time_steps=number_time_steps)
+		self.initialize_multiple_contour_epicycles()
+
+	def view_contour_group(self, fps=60, is_show_contour=False, is_show_dft=False, is_with_axes=False, contour_color="steelblue", dft_color="limegreen", curve_color="darkorange", radius_color="silver", circle_color="black", number_thetas=100, figsize=None, is_save=False, extension=".mp4", is_blit=False, is_stream=False, codec=None, crf=None, pixel_format=None):
+		from plotter_configuration import ContourEpicyclesViewer
+		plotter = ContourEpicyclesViewer()
+		plotter.initialize_visual_settings()
+		plotter.update_save_directory(
+			path_to_save_directory=self.visual_settings.path_to_save_directory)
+		plotter.view_contour_group(
+			contour_group=self,
+			fps=fps,
+			is_show_contour=is_show_contour,
+			is_show_dft=is_show_dft,
+			is_with_axes=is_with_axes,
+			contour_color=contour_color,
+			dft_color=dft_color,
+			curve_color=curve_color,
+			radius_color=radius_color,
+			circle_color=circle_color,
+			number_thetas=number_thetas,
+			figsize=figsize,
+			is_save=is_save,
+			extension=extension,
+			is_blit=is_blit,
+			is_stream=is_stream,
+			codec=codec,
+			crf=crf,
+			pixel_format=pixel_format)
+
+##
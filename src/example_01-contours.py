@@ -22,13 +22,12 @@ if __name__ == "__main__":
 
 	for path_to_image in paths_to_images:
 		contour_epicycle = ContourEpicyclesConfiguration()
-		contour_epicycle.initialize_visual_settings()
-		contour_epicycle.update_save_directory(
-			path_to_save_directory=path_to_save_directory)
-		contour_epicycle.initialize_contour(
+		contour_epicycle.initialize(
 			path_to_image=path_to_image,
 			threshold=0.5,
 			index_at_contour=0)
+		contour_epicycle.update_save_directory(
+			path_to_save_directory=path_to_save_directory)
 		contour_epicycle.view_image(
 			is_show_contour=True,
 			is_with_axes=True,
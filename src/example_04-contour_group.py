@@ -0,0 +1,37 @@
+from contour_group_configuration import ContourGroupConfiguration
+
+
+# is_save, path_to_save_directory = False, None
+is_save, path_to_save_directory = True, "/Users/owner/Desktop/programming/contour_epicycles/output/"
+
+## images with several disjoint shapes or holes
+paths_to_images = [
+	"/Users/owner/Desktop/programming/contour_epicycles/data/caduceus.png",
+	"/Users/owner/Desktop/programming/contour_epicycles/data/ankh.png",
+	"/Users/owner/Desktop/programming/contour_epicycles/data/anubis.png",
+	"/Users/owner/Desktop/programming/contour_epicycles/data/thoth_writing.png"]
+
+
+if __name__ == "__main__":
+
+	for path_to_image in paths_to_images:
+		contour_group = ContourGroupConfiguration()
+		contour_group.initialize(
+			path_to_image=path_to_image,
+			minimum_number_points=100,
+			maximum_order=100,
+			number_time_steps=1080,
+			parameterization="arc-length")
+		contour_group.update_save_directory(
+			path_to_save_directory=path_to_save_directory)
+		contour_group.view_contour_group(
+			is_show_contour=True,
+			is_show_dft=True,
+			is_with_axes=True,
+			figsize=(12, 7),
+			is_save=is_save,
+			extension=".gif",
+			is_blit=True,
+			is_stream=True)
+
+##
\ No newline at end of file
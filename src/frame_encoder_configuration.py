@@ -0,0 +1,282 @@
+import os
+import subprocess
+import tempfile
+
+
+class BaseFrameEncoderConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._save_path = None
+		self._width = None
+		self._height = None
+		self._fps = None
+		self._codec = None
+		self._crf = None
+		self._pixel_format = None
+		self._process = None
+		self._error_file = None
+		self._number_frames = None
+
+	@property
+	def save_path(self):
+		return self._save_path
+
+	@property
+	def width(self):
+		return self._width
+
+	@property
+	def height(self):
+		return self._height
+
+	@property
+	def fps(self):
+		return self._fps
+
+	@property
+	def codec(self):
+		return self._codec
+
+	@property
+	def crf(self):
+		return self._crf
+
+	@property
+	def pixel_format(self):
+		return self._pixel_format
+
+	@property
+	def process(self):
+		return self._process
+
+	@property
+	def error_file(self):
+		return self._error_file
+
+	@property
+	def number_frames(self):
+		return self._number_frames
+
+	@staticmethod
+	def get_default_encoding(extension):
+		mapping = {
+			".mp4" : {
+				"codec" : "libx264",
+				"crf" : 18,
+				"pixel-format" : "yuv420p"},
+			".mkv" : {
+				"codec" : "libx264",
+				"crf" : 18,
+				"pixel-format" : "yuv420p"},
+			".mov" : {
+				"codec" : "libx264",
+				"crf" : 18,
+				"pixel-format" : "yuv420p"},
+			".webm" : {
+				"codec" : "libvpx-vp9",
+				"crf" : 30,
+				"pixel-format" : "yuv420p"},
+			".gif" : {
+				"codec" : None,
+				"crf" : None,
+				"pixel-format" : None},
+			## lossless intermediate segments
+			".nut" : {
+				"codec" : "ffv1",
+				"crf" : None,
+				"pixel-format" : None}}
+		if extension not in mapping.keys():
+			raise ValueError("invalid extension: {}".format(extension))
+		default_encoding = mapping[extension]
+		return default_encoding
+
+	@staticmethod
+	def get_ffmpeg_command(save_path, width, height, fps, codec, crf, pixel_format):
+		## frames arrive as raw rgba bytes straight from the Agg buffer; ffmpeg drops the alpha channel
+		from matplotlib import rcParams
+		command = [
+			rcParams["animation.ffmpeg_path"],
+			"-y",
+			"-loglevel", "error",
+			"-f", "rawvideo",
+			"-vcodec", "rawvideo",
+			"-s", "{}x{}".format(width, height),
+			"-pix_fmt", "rgba",
+			"-r", str(fps),
+			"-i", "-",
+			## chroma-subsampled pixel formats require even dimensions
+			"-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+		if codec is not None:
+			command.extend([
+				"-vcodec",
+				codec])
+		if crf is not None:
+			command.extend([
+				"-crf",
+				str(crf)])
+		if pixel_format is not None:
+			command.extend([
+				"-pix_fmt",
+				pixel_format])
+		command.append(
+			save_path)
+		return command
+
+	@staticmethod
+	def get_segment_extension(extension):
+		## every format is segmented losslessly; joining lossy segments by stream copy would differ
+		## from a serial render, since each segment would be its own lossy encode
+		segment_extension = ".nut"
+		return segment_extension
+
+	@staticmethod
+	def get_concatenation_command(path_to_segment_list, save_path, is_copy, codec, crf, pixel_format):
+		from matplotlib import rcParams
+		command = [
+			rcParams["animation.ffmpeg_path"],
+			"-y",
+			"-loglevel", "error",
+			"-f", "concat",
+			"-safe", "0",
+			"-i", path_to_segment_list]
+		if is_copy:
+			command.extend([
+				"-c",
+				"copy"])
+		else:
+			if codec is not None:
+				command.extend([
+					"-vcodec",
+					codec])
+			if crf is not None:
+				command.extend([
+					"-crf",
+					str(crf)])
+			if pixel_format is not None:
+				command.extend([
+					"-pix_fmt",
+					pixel_format])
+		command.append(
+			save_path)
+		return command
+
+	@classmethod
+	def concatenate_segments(cls, paths_to_segments, save_path, extension, durations=None, codec=None, crf=None, pixel_format=None):
+		## lossless segments are encoded once into the target format, so the output matches a serial render;
+		## explicit durations keep the last frame of each segment from colliding with the next segment
+		if len(paths_to_segments) == 0:
+			raise ValueError("zero segments found")
+		if durations is None:
+			durations = [
+				None
+					for _ in paths_to_segments]
+		if len(durations) != len(paths_to_segments):
+			raise ValueError("{} durations and {} segments are not compatible".format(len(durations), len(paths_to_segments)))
+		is_copy = (cls.get_segment_extension(extension=extension) == extension)
+		default_encoding = cls.get_default_encoding(
+			extension=extension)
+		if codec is None:
+			codec = default_encoding["codec"]
+		if crf is None:
+			crf = default_encoding["crf"]
+		if pixel_format is None:
+			pixel_format = default_encoding["pixel-format"]
+		with tempfile.NamedTemporaryFile("w", suffix=".txt", dir=os.path.dirname(paths_to_segments[0]), delete=False) as segment_list:
+			for path_to_segment, duration in zip(paths_to_segments, durations):
+				segment_list.write(
+					"file '{}'\n".format(
+						os.path.abspath(path_to_segment).replace("'", "'\\''")))
+				if duration is not None:
+					segment_list.write(
+						"duration {}\n".format(
+							duration))
+		command = cls.get_concatenation_command(
+			path_to_segment_list=segment_list.name,
+			save_path=save_path,
+			is_copy=is_copy,
+			codec=codec,
+			crf=crf,
+			pixel_format=pixel_format)
+		try:
+			completed_process = subprocess.run(
+				command,
+				stderr=subprocess.PIPE)
+		finally:
+			os.remove(
+				segment_list.name)
+		if completed_process.returncode != 0:
+			raise RuntimeError("ffmpeg exited with return code {} while writing {}:\n{}".format(completed_process.returncode, save_path, completed_process.stderr.decode()))
+
+class FrameEncoderConfiguration(BaseFrameEncoderConfiguration):
+
+	def __init__(self):
+		super().__init__()
+
+	def initialize(self, save_path, width, height, fps, extension, codec=None, crf=None, pixel_format=None):
+		if not isinstance(save_path, str):
+			raise ValueError("invalid type(save_path): {}".format(type(save_path)))
+		if not isinstance(fps, (int, float)):
+			raise ValueError("invalid type(fps): {}".format(type(fps)))
+		if fps <= 0:
+			raise ValueError("invalid fps: {}".format(fps))
+		default_encoding = self.get_default_encoding(
+			extension=extension)
+		if codec is None:
+			codec = default_encoding["codec"]
+		if crf is None:
+			crf = default_encoding["crf"]
+		if pixel_format is None:
+			pixel_format = default_encoding["pixel-format"]
+		command = self.get_ffmpeg_command(
+			save_path=save_path,
+			width=width,
+			height=height,
+			fps=fps,
+			codec=codec,
+			crf=crf,
+			pixel_format=pixel_format)
+		## stderr goes to a file rather than a pipe, so ffmpeg can never block on a full pipe that
+		## is only read once the last frame is written
+		error_file = tempfile.TemporaryFile()
+		process = subprocess.Popen(
+			command,
+			stdin=subprocess.PIPE,
+			stderr=error_file)
+		self._save_path = save_path
+		self._width = width
+		self._height = height
+		self._fps = fps
+		self._codec = codec
+		self._crf = crf
+		self._pixel_format = pixel_format
+		self._process = process
+		self._error_file = error_file
+		self._number_frames = 0
+
+	def write_frame(self, frame_buffer):
+		if self.process is None:
+			raise ValueError("encoder is not initialized")
+		self.process.stdin.write(
+			frame_buffer)
+		self._number_frames += 1
+
+	def finalize(self):
+		if self.process is None:
+			raise ValueError("encoder is not initialized")
+		## closing stdin flushes it, which fails if ffmpeg already exited; the process is waited on
+		## and its error file closed regardless
+		try:
+			self.process.stdin.close()
+		except BrokenPipeError:
+			pass
+		return_code = self.process.wait()
+		self.error_file.seek(0)
+		error_message = self.error_file.read()
+		self.error_file.close()
+		self._process = None
+		self._error_file = None
+		if return_code != 0:
+			raise RuntimeError("ffmpeg exited with return code {} while writing {}:\n{}".format(return_code, self.save_path, error_message.decode()))
+
+##
@@ -1,16 +1,25 @@
 from pathlib import Path
-from skimage import measure, filters, io
+from PIL import Image
 import numpy as np
+from cache_configuration import ContourCacheConfiguration
 
 
 class BaseImageContourConfiguration():
 
+	## only the complex samples are stored; x and y are views of their real and imaginary parts
+	__slots__ = (
+		"_path_to_image",
+		"_name",
+		"_parameterization",
+		"_simplification_report",
+		"_z")
+
 	def __init__(self):
 		super().__init__()
 		self._path_to_image = None
 		self._name = None
-		self._x = None
-		self._y = None
+		self._parameterization = None
+		self._simplification_report = None
 		self._z = None
 
 	@property
@@ -21,13 +30,25 @@ class BaseImageContourConfiguration():
 	def name(self):
 		return self._name
 
+	@property
+	def parameterization(self):
+		return self._parameterization
+
+	@property
+	def simplification_report(self):
+		return self._simplification_report
+
 	@property
 	def x(self):
-		return self._x
+		if self._z is None:
+			return None
+		return self._z.real
 	
 	@property
 	def y(self):
-		return self._y
+		if self._z is None:
+			return None
+		return self._z.imag
 
 	@property
 	def z(self):
@@ -54,45 +75,509 @@ class BaseImageContourConfiguration():
 		return x, y
 
 	@staticmethod
-	def get_contour(path_to_image, threshold, index_at_contour):
-		colorized_image = io.imread(
-			path_to_image)
-		grayscale_image = np.mean(
-			colorized_image,
-			axis=2)
+	def get_arc_length_resampled_contour(x, y, number_points=None):
+		if number_points is None:
+			number_points = x.size
+		if not isinstance(number_points, int):
+			raise ValueError("invalid type(number_points): {}".format(type(number_points)))
+		if number_points <= 2:
+			raise ValueError("invalid number_points: {}".format(number_points))
+		arc_lengths = np.concatenate([
+			[0],
+			np.cumsum(
+				np.hypot(
+					np.diff(x),
+					np.diff(y)))])
+		resampled_arc_lengths = np.linspace(
+			0,
+			arc_lengths[-1],
+			number_points)
+		resampled_x = np.interp(
+			resampled_arc_lengths,
+			arc_lengths,
+			x)
+		resampled_y = np.interp(
+			resampled_arc_lengths,
+			arc_lengths,
+			y)
+		return resampled_x, resampled_y
+
+	@staticmethod
+	def get_index_resampled_contour(x, y, number_points):
+		if not isinstance(number_points, int):
+			raise ValueError("invalid type(number_points): {}".format(type(number_points)))
+		if number_points <= 2:
+			raise ValueError("invalid number_points: {}".format(number_points))
+		indices = np.arange(
+			x.size)
+		resampled_indices = np.linspace(
+			0,
+			x.size - 1,
+			number_points)
+		resampled_x = np.interp(
+			resampled_indices,
+			indices,
+			x)
+		resampled_y = np.interp(
+			resampled_indices,
+			indices,
+			y)
+		return resampled_x, resampled_y
+
+	@staticmethod
+	def get_simplified_contour(x, y, tolerance):
+		## ramer-douglas-peucker; closed contours stay closed
+		from skimage import measure
+		if not isinstance(tolerance, (int, float)):
+			raise ValueError("invalid type(tolerance): {}".format(type(tolerance)))
+		if tolerance <= 0:
+			raise ValueError("invalid tolerance: {}".format(tolerance))
+		simplified_contour = measure.approximate_polygon(
+			np.stack([
+				x,
+				y],
+				axis=1),
+			tolerance=tolerance)
+		simplified_x = np.ascontiguousarray(
+			simplified_contour[:, 0])
+		simplified_y = np.ascontiguousarray(
+			simplified_contour[:, 1])
+		return simplified_x, simplified_y
+
+	@staticmethod
+	def get_deviations(x, y, polyline_x, polyline_y, spacing=0.1):
+		## each point is matched to a segment through the nearest of the densely resampled polyline points,
+		## then measured against that segment exactly; deviations are overestimated by at most spacing / 2
+		from scipy.spatial import cKDTree
+		delta_x, delta_y = np.diff(polyline_x), np.diff(polyline_y)
+		squared_lengths = delta_x**2 + delta_y**2
+		number_samples_per_segment = np.maximum(
+			1,
+			np.ceil(np.sqrt(squared_lengths) / spacing).astype(int))
+		segment_indices = np.repeat(
+			np.arange(
+				squared_lengths.size),
+			number_samples_per_segment)
+		offsets = np.arange(segment_indices.size) - np.repeat(
+			np.cumsum(number_samples_per_segment) - number_samples_per_segment,
+			number_samples_per_segment)
+		fractions = offsets / number_samples_per_segment[segment_indices]
+		tree = cKDTree(
+			np.stack([
+				polyline_x[segment_indices] + fractions * delta_x[segment_indices],
+				polyline_y[segment_indices] + fractions * delta_y[segment_indices]],
+				axis=1))
+		_, nearest_indices = tree.query(
+			np.stack([
+				x,
+				y],
+				axis=1))
+		segment_indices = segment_indices[nearest_indices]
+		squared_lengths[squared_lengths == 0] = 1
+		projections = np.clip(
+			((x - polyline_x[segment_indices]) * delta_x[segment_indices] + (y - polyline_y[segment_indices]) * delta_y[segment_indices]) / squared_lengths[segment_indices],
+			0,
+			1)
+		deviations = np.hypot(
+			polyline_x[segment_indices] + projections * delta_x[segment_indices] - x,
+			polyline_y[segment_indices] + projections * delta_y[segment_indices] - y)
+		return deviations
+
+	def get_simplification_report(self, x, y, simplified_x, simplified_y):
+		deviations = self.get_deviations(
+			x=x,
+			y=y,
+			polyline_x=simplified_x,
+			polyline_y=simplified_y)
+		simplification_report = {
+			"number-original-points" : x.size,
+			"number-points" : simplified_x.size,
+			"reduction-factor" : x.size / simplified_x.size,
+			"maximum-deviation" : float(np.max(deviations)),
+			"root-mean-square-deviation" : float(np.sqrt(np.mean(deviations**2)))}
+		return simplification_report
+
+	@staticmethod
+	def get_image(path_to_image, maximum_pixels=None):
+		## decodes into the native integer dtype; images above the pixel budget are reduced while decoding (jpeg)
+		## or right after it (other formats), so the budget does not bound the peak memory of decoding itself
+		if maximum_pixels is not None:
+			if not isinstance(maximum_pixels, int):
+				raise ValueError("invalid type(maximum_pixels): {}".format(type(maximum_pixels)))
+			if maximum_pixels <= 0:
+				raise ValueError("invalid maximum_pixels: {}".format(maximum_pixels))
+		with Image.open(path_to_image) as image:
+			original_width, original_height = image.size
+			if (maximum_pixels is not None) and (original_width * original_height > maximum_pixels):
+				reduction_factor = np.sqrt(original_width * original_height / maximum_pixels)
+				## jpeg decoders skip the discarded coefficients entirely; other formats ignore the draft
+				image.draft(
+					None,
+					(int(np.ceil(original_width / reduction_factor)), int(np.ceil(original_height / reduction_factor))))
+			if image.mode == "P":
+				if "transparency" in image.info:
+					image = image.convert("RGBA")
+				else:
+					image = image.convert("RGB")
+			elif image.mode == "1":
+				image = image.convert("L")
+			elif image.mode not in ("L", "LA", "RGB", "RGBA", "I;16", "I", "F"):
+				image = image.convert("RGB")
+			width, height = image.size
+			if (maximum_pixels is not None) and (width * height > maximum_pixels):
+				reduction_factor = int(
+					np.ceil(
+						np.sqrt(width * height / maximum_pixels)))
+				## Image.reduce does not accept the 16-bit modes; a box filter to the same size averages
+				## blocks of the same extent without widening every pixel to 32 bits first
+				if image.mode.startswith("I;16"):
+					image = image.resize(
+						(int(np.ceil(width / reduction_factor)), int(np.ceil(height / reduction_factor))),
+						resample=Image.Resampling.BOX)
+				else:
+					image = image.reduce(
+						reduction_factor)
+			pixels = np.asarray(
+				image)
+		row_scale = original_height / pixels.shape[0]
+		column_scale = original_width / pixels.shape[1]
+		return pixels, row_scale, column_scale
+
+	@staticmethod
+	def get_grayscale_image(pixels, alpha_mode="mean"):
+		if pixels.ndim == 2:
+			pixels = pixels[:, :, np.newaxis]
+		number_channels = pixels.shape[2]
+		is_with_alpha = (number_channels in (2, 4))
+		if alpha_mode == "mean":
+			## alpha is averaged in with the color channels, which separates transparent backgrounds
+			channels = pixels
+		elif alpha_mode == "ignore":
+			if is_with_alpha:
+				channels = pixels[:, :, :-1]
+			else:
+				channels = pixels
+		elif alpha_mode == "mask":
+			if not is_with_alpha:
+				raise ValueError("alpha_mode='mask' requires an image with an alpha channel")
+			channels = pixels[:, :, -1:]
+			## a constant alpha channel (e.g. a fully opaque export) has no contours to trace
+			if np.min(channels) == np.max(channels):
+				raise ValueError("invalid alpha_mode: mask (alpha channel is constant)")
+		else:
+			raise ValueError("invalid alpha_mode: {}".format(alpha_mode))
+		## accumulates in float32 instead of promoting the whole image to float64
+		if channels.shape[2] == 1:
+			grayscale_image = channels[:, :, 0].astype(
+				np.float32)
+		else:
+			grayscale_image = np.sum(
+				channels,
+				axis=2,
+				dtype=np.float32)
+			grayscale_image /= channels.shape[2]
+		return grayscale_image
+
+	@staticmethod
+	def get_enclosed_area(contour):
+		## shoelace formula over the closed polygon
+		rows, columns = contour[:, 0], contour[:, 1]
+		enclosed_area = 0.5 * np.abs(
+			np.dot(rows, np.roll(columns, 1)) - np.dot(columns, np.roll(rows, 1)))
+		return enclosed_area
+
+	@staticmethod
+	def get_is_background_high(binary_image):
+		## the phase that covers most of the image border is taken to be the background
+		border = np.concatenate([
+			binary_image[0, :],
+			binary_image[-1, :],
+			binary_image[:, 0],
+			binary_image[:, -1]])
+		is_background_high = bool(
+			np.mean(border) > 0.5)
+		return is_background_high
+
+	@classmethod
+	def get_foreground_image(cls, binary_image):
+		if cls.get_is_background_high(binary_image=binary_image):
+			foreground_image = np.logical_not(
+				binary_image)
+		else:
+			foreground_image = binary_image
+		return foreground_image
+
+	@classmethod
+	def get_selected_contour(cls, binary_image, threshold, selection, point_at_contour=None):
+		## labels the foreground first, then traces only the boundary of the selected region
+		from skimage import measure
+		from scipy import ndimage
+		is_background_high = cls.get_is_background_high(
+			binary_image=binary_image)
+		foreground_image = cls.get_foreground_image(
+			binary_image=binary_image)
+		## marching squares joins high pixels along edges only and low pixels across corners too,
+		## so the foreground is labelled with the connectivity of the phase it is in
+		labels, number_labels = measure.label(
+			foreground_image,
+			connectivity=2 if is_background_high else 1,
+			return_num=True)
+		if number_labels == 0:
+			raise ValueError("zero foreground regions found")
+		## regions are scored with one pass over the labels instead of one python object per region
+		if selection == "length":
+			## the number of boundary pixels stands in for the perimeter without tracing every region
+			boundary_image = np.logical_and(
+				foreground_image,
+				np.logical_not(
+					ndimage.binary_erosion(
+						foreground_image)))
+			scores = np.bincount(
+				labels[boundary_image],
+				minlength=number_labels + 1)
+			scores[0] = 0
+			label = int(
+				np.argmax(
+					scores))
+		elif selection == "area":
+			scores = np.bincount(
+				labels.ravel(),
+				minlength=number_labels + 1)
+			scores[0] = 0
+			label = int(
+				np.argmax(
+					scores))
+		elif selection == "point":
+			if not isinstance(point_at_contour, (tuple, list, np.ndarray)):
+				raise ValueError("invalid type(point_at_contour): {}".format(type(point_at_contour)))
+			if len(point_at_contour) != 2:
+				raise ValueError("invalid point_at_contour: {}".format(point_at_contour))
+			column, row = int(round(point_at_contour[0])), int(round(point_at_contour[1]))
+			if not ((0 <= row < labels.shape[0]) and (0 <= column < labels.shape[1])):
+				raise ValueError("invalid point_at_contour: {}".format(point_at_contour))
+			label = int(
+				labels[row, column])
+			if label == 0:
+				raise ValueError("point_at_contour lies in the background: {}".format(point_at_contour))
+		else:
+			raise ValueError("invalid selection: {}".format(selection))
+		row_slice, column_slice = ndimage.find_objects(
+			labels,
+			max_label=label)[label - 1]
+		## one pixel of padding closes contours of regions that touch the edge of the crop; the region keeps
+		## the phase it has in the binary image, so it is traced exactly as find_contours traces the whole image
+		region_image = np.pad(
+			labels[row_slice, column_slice] == label,
+			1)
+		if is_background_high:
+			region_image = np.logical_not(
+				region_image)
+		contours = measure.find_contours(
+			region_image,
+			threshold)
+		## the outer boundary encloses every hole of the region
+		contour = max(
+			contours,
+			key=cls.get_enclosed_area)
+		contour[:, 0] += row_slice.start - 1
+		contour[:, 1] += column_slice.start - 1
+		return contour
+
+	@classmethod
+	def get_binary_image(cls, path_to_image, alpha_mode="mean", maximum_pixels=None):
+		from skimage import filters
+		pixels, row_scale, column_scale = cls.get_image(
+			path_to_image=path_to_image,
+			maximum_pixels=maximum_pixels)
+		grayscale_image = cls.get_grayscale_image(
+			pixels=pixels,
+			alpha_mode=alpha_mode)
+		del pixels
 		binary_image = (
 			grayscale_image > filters.threshold_otsu(
 				grayscale_image))
+		return binary_image, row_scale, column_scale
+
+	@staticmethod
+	def get_rescaled_contour(contour, row_scale, column_scale):
+		## reduced pixels are mapped back onto the coordinates of the full-resolution image
+		if (row_scale != 1) or (column_scale != 1):
+			contour[:, 0] = contour[:, 0] * row_scale + (row_scale - 1) / 2
+			contour[:, 1] = contour[:, 1] * column_scale + (column_scale - 1) / 2
+		return contour
+
+	@classmethod
+	def get_contour(cls, path_to_image, threshold, index_at_contour, alpha_mode="mean", maximum_pixels=None, selection="index", point_at_contour=None):
+		from skimage import measure
+		binary_image, row_scale, column_scale = cls.get_binary_image(
+			path_to_image=path_to_image,
+			alpha_mode=alpha_mode,
+			maximum_pixels=maximum_pixels)
+		if selection == "index":
+			contours = measure.find_contours(
+				binary_image,
+				threshold)
+			if not (-len(contours) <= index_at_contour < len(contours)):
+				raise ValueError("invalid index_at_contour: {} ({} contours found)".format(index_at_contour, len(contours)))
+			contour = contours[index_at_contour]
+		else:
+			## point_at_contour is given as (x, y) in pixels of the full-resolution image
+			if point_at_contour is not None:
+				point_at_contour = (
+					(point_at_contour[0] - (column_scale - 1) / 2) / column_scale,
+					(point_at_contour[1] - (row_scale - 1) / 2) / row_scale)
+			contour = cls.get_selected_contour(
+				binary_image=binary_image,
+				threshold=threshold,
+				selection=selection,
+				point_at_contour=point_at_contour)
+		contour = cls.get_rescaled_contour(
+			contour=contour,
+			row_scale=row_scale,
+			column_scale=column_scale)
+		return contour
+
+	@classmethod
+	def get_contours(cls, path_to_image, threshold, indices_at_contours=None, minimum_number_points=100, alpha_mode="mean", maximum_pixels=None):
+		## every contour with at least minimum_number_points points, unless the indices are given explicitly
+		from skimage import measure
+		binary_image, row_scale, column_scale = cls.get_binary_image(
+			path_to_image=path_to_image,
+			alpha_mode=alpha_mode,
+			maximum_pixels=maximum_pixels)
 		contours = measure.find_contours(
 			binary_image,
 			threshold)
-		contour = contours[index_at_contour]
-		return contour
+		if indices_at_contours is None:
+			if not isinstance(minimum_number_points, int):
+				raise ValueError("invalid type(minimum_number_points): {}".format(type(minimum_number_points)))
+			contours = [
+				contour
+					for contour in contours
+						if contour.shape[0] >= minimum_number_points]
+		else:
+			for index_at_contour in indices_at_contours:
+				if not (-len(contours) <= index_at_contour < len(contours)):
+					raise ValueError("invalid index_at_contour: {} ({} contours found)".format(index_at_contour, len(contours)))
+			contours = [
+				contours[index_at_contour]
+					for index_at_contour in indices_at_contours]
+		if len(contours) == 0:
+			raise ValueError("zero contours found")
+		contours = [
+			cls.get_rescaled_contour(
+				contour=contour,
+				row_scale=row_scale,
+				column_scale=column_scale)
+					for contour in contours]
+		return contours
+
+	def get_processed_contour(self, contour, parameterization="index", simplification_tolerance=None, number_contour_points=None):
+		x = contour[:, 1]
+		y = contour[:, 0] * -1
+		original_x, original_y = np.copy(x), np.copy(y)
+		if simplification_tolerance is not None:
+			x, y = self.get_simplified_contour(
+				x=x,
+				y=y,
+				tolerance=simplification_tolerance)
+		if parameterization == "arc-length":
+			x, y = self.get_arc_length_resampled_contour(
+				x=x,
+				y=y,
+				number_points=number_contour_points)
+		elif parameterization == "index":
+			if number_contour_points is not None:
+				x, y = self.get_index_resampled_contour(
+					x=x,
+					y=y,
+					number_points=number_contour_points)
+		else:
+			raise ValueError("invalid parameterization: {}".format(parameterization))
+		if (simplification_tolerance is not None) or (number_contour_points is not None):
+			simplification_report = self.get_simplification_report(
+				x=original_x,
+				y=original_y,
+				simplified_x=x,
+				simplified_y=y)
+		else:
+			simplification_report = None
+		return x, y, simplification_report
 
 class ImageContourConfiguration(BaseImageContourConfiguration):
 
+	__slots__ = ()
+
 	def __init__(self):
 		super().__init__()
 
-	def initialize(self, path_to_image, threshold, index_at_contour):
+	def get_cached_contour(self, path_to_image, threshold, index_at_contour, alpha_mode="mean", maximum_pixels=None, selection="index", point_at_contour=None, path_to_cache_directory=None):
+		contour_cache = ContourCacheConfiguration()
+		contour_cache.initialize(
+			path_to_cache_directory=path_to_cache_directory)
+		contour_key = contour_cache.get_contour_key(
+			path_to_image=path_to_image,
+			threshold=threshold,
+			index_at_contour=index_at_contour,
+			alpha_mode=alpha_mode,
+			maximum_pixels=maximum_pixels,
+			selection=selection,
+			point_at_contour=point_at_contour)
+		contour = contour_cache.load_contour(
+			contour_key=contour_key)
+		if contour is None:
+			contour = self.get_contour(
+				path_to_image=path_to_image,
+				threshold=threshold,
+				index_at_contour=index_at_contour,
+				alpha_mode=alpha_mode,
+				maximum_pixels=maximum_pixels,
+				selection=selection,
+				point_at_contour=point_at_contour)
+			contour_cache.save_contour(
+				contour=contour,
+				contour_key=contour_key)
+		return contour
+
+	def initialize(self, path_to_image, threshold, index_at_contour, parameterization="index", alpha_mode="mean", maximum_pixels=None, selection="index", point_at_contour=None, simplification_tolerance=None, number_contour_points=None, is_cache_contour=True, path_to_cache_directory=None):
 		if not isinstance(path_to_image, str):
 			raise ValueError("invalid type(path_to_image): {}".format(type(path_to_image)))
+		if not isinstance(is_cache_contour, bool):
+			raise ValueError("invalid type(is_cache_contour): {}".format(type(is_cache_contour)))
 		name = self.get_name_from_path(
 			path_to_image=path_to_image)
-		contour = self.get_contour(
-			path_to_image=path_to_image,
-			threshold=threshold,
-			index_at_contour=index_at_contour)
-		x = contour[:, 1]
-		y = contour[:, 0] * -1
+		if is_cache_contour:
+			contour = self.get_cached_contour(
+				path_to_image=path_to_image,
+				threshold=threshold,
+				index_at_contour=index_at_contour,
+				alpha_mode=alpha_mode,
+				maximum_pixels=maximum_pixels,
+				selection=selection,
+				point_at_contour=point_at_contour,
+				path_to_cache_directory=path_to_cache_directory)
+		else:
+			contour = self.get_contour(
+				path_to_image=path_to_image,
+				threshold=threshold,
+				index_at_contour=index_at_contour,
+				alpha_mode=alpha_mode,
+				maximum_pixels=maximum_pixels,
+				selection=selection,
+				point_at_contour=point_at_contour)
+		x, y, simplification_report = self.get_processed_contour(
+			contour=contour,
+			parameterization=parameterization,
+			simplification_tolerance=simplification_tolerance,
+			number_contour_points=number_contour_points)
 		x, y = self.center_about_origin(
 			x=x,
 			y=y)
 		z = x + 1j * y
 		self._path_to_image = path_to_image
 		self._name = name
-		self._x = x
-		self._y = y
+		self._parameterization = parameterization
+		self._simplification_report = simplification_report
 		self._z = z
 
 ##
\ No newline at end of file
@@ -0,0 +1,291 @@
+import os
+import sys
+import json
+import time
+import cProfile
+import functools
+import contextlib
+
+
+## the active instrumentation of this process; None keeps every stage at the cost of one check
+_instrumentation = None
+
+
+def get_instrumentation():
+	return _instrumentation
+
+def set_instrumentation(instrumentation=None):
+	global _instrumentation
+	if (instrumentation is not None) and (not isinstance(instrumentation, BaseInstrumentationConfiguration)):
+		raise ValueError("invalid type(instrumentation): {}".format(type(instrumentation)))
+	_instrumentation = instrumentation
+
+@contextlib.contextmanager
+def time_stage(stage, configuration=None, **counts):
+	## yields the record so that the stage can add counts; the record is emitted when the stage exits
+	instrumentation = get_instrumentation()
+	if instrumentation is None:
+		yield {
+			"counts" : dict()}
+	else:
+		with instrumentation.time_stage(stage=stage, configuration=configuration, **counts) as record:
+			yield record
+
+def update_stage_counts(counts):
+	## adds counts to the innermost open stage, e.g. totals accumulated over the frames of an animation
+	instrumentation = get_instrumentation()
+	if instrumentation is not None:
+		instrumentation.update_counts(
+			counts=counts)
+
+def instrument_stage(stage, configuration_name=None):
+	## decorates a method as a stage; the name, order and time steps are read from self
+	## or from the keyword argument configuration_name once the method returns
+	def get_instrumented_method(method):
+		@functools.wraps(method)
+		def instrumented_method(self, *args, **kwargs):
+			if get_instrumentation() is None:
+				return method(self, *args, **kwargs)
+			if configuration_name is None:
+				configuration = self
+			else:
+				configuration = kwargs.get(
+					configuration_name,
+					None)
+			with time_stage(stage=stage, configuration=configuration):
+				return method(self, *args, **kwargs)
+		return instrumented_method
+	return get_instrumented_method
+
+
+class BaseInstrumentationConfiguration():
+
+	def __init__(self):
+		super().__init__()
+		self._sinks = None
+		self._records = None
+		self._profiled_stages = None
+		self._path_to_profile_directory = None
+		self._stack = None
+		self._profiler = None
+		self._number_profiles = None
+
+	@property
+	def sinks(self):
+		return self._sinks
+
+	@property
+	def records(self):
+		return self._records
+
+	@property
+	def profiled_stages(self):
+		return self._profiled_stages
+
+	@property
+	def path_to_profile_directory(self):
+		return self._path_to_profile_directory
+
+	@staticmethod
+	def get_print_sink(stream=None):
+		def print_sink(record):
+			print(
+				BaseInstrumentationConfiguration.get_record_line(
+					record=record),
+				file=sys.stderr if stream is None else stream)
+		return print_sink
+
+	@staticmethod
+	def get_json_lines_sink(path_to_file):
+		## one json object per line in append mode, so worker processes can share the file
+		if not isinstance(path_to_file, str):
+			raise ValueError("invalid type(path_to_file): {}".format(type(path_to_file)))
+		def json_lines_sink(record):
+			with open(path_to_file, "a") as f:
+				f.write(
+					json.dumps(record) + "\n")
+		return json_lines_sink
+
+	@staticmethod
+	def get_record_line(record):
+		counts = " ".join(
+			"{}={}".format(name, "{:.4f}".format(value) if isinstance(value, float) else value)
+				for name, value in record["counts"].items())
+		record_line = "{}{:<28}{:<16}{:>6}{:>7}{:>11.4f} s  {}".format(
+			"  " * record["depth"],
+			record["stage"],
+			"" if record["name"] is None else record["name"],
+			"" if record["maximum-order"] is None else record["maximum-order"],
+			"" if record["number-time-steps"] is None else record["number-time-steps"],
+			record["duration"],
+			counts)
+		return record_line
+
+	@staticmethod
+	def update_record_by_configuration(record, configuration):
+		## values that are set on the configuration replace those in the record
+		if configuration is None:
+			return
+		contour = getattr(
+			configuration,
+			"contour",
+			None)
+		if contour is not None:
+			if contour.name is not None:
+				record["name"] = contour.name
+			if contour.z is not None:
+				record["counts"]["number-contour-points"] = int(
+					contour.z.size)
+		for key, attribute_name in (("maximum-order", "maximum_order"), ("number-time-steps", "number_time_steps")):
+			value = getattr(
+				configuration,
+				attribute_name,
+				None)
+			if value is not None:
+				record[key] = int(
+					value)
+
+	def add_sink(self, sink):
+		if not callable(sink):
+			raise ValueError("invalid type(sink): {}".format(type(sink)))
+		self._sinks.append(
+			sink)
+
+	def emit(self, record):
+		self._records.append(
+			record)
+		for sink in self.sinks:
+			sink(
+				record)
+
+	def is_profiled(self, stage):
+		if self.profiled_stages is None:
+			return False
+		return (self.profiled_stages == "all") or (stage in self.profiled_stages)
+
+	@contextlib.contextmanager
+	def time_stage(self, stage, configuration=None, **counts):
+		record = {
+			"stage" : stage,
+			"name" : None,
+			"maximum-order" : None,
+			"number-time-steps" : None,
+			"parent-stage" : self._stack[-1]["stage"] if len(self._stack) > 0 else None,
+			"depth" : len(self._stack),
+			"process-id" : os.getpid(),
+			"start-time" : time.time(),
+			"duration" : None,
+			"is-success" : True,
+			"path-to-profile" : None,
+			"counts" : dict(counts)}
+		## stages without a configuration of their own, e.g. the encoding of an animation, inherit from the enclosing stage
+		self.update_record_by_configuration(
+			record=record,
+			configuration=configuration)
+		if len(self._stack) > 0:
+			for key in ("name", "maximum-order", "number-time-steps"):
+				if record[key] is None:
+					record[key] = self._stack[-1][key]
+		## a profile covers every stage nested inside the outermost profiled stage
+		if (self._profiler is None) and self.is_profiled(stage):
+			profiler = cProfile.Profile()
+		else:
+			profiler = None
+		self._stack.append(
+			record)
+		start_time = time.perf_counter()
+		if profiler is not None:
+			self._profiler = profiler
+			profiler.enable()
+		try:
+			yield record
+		except BaseException:
+			record["is-success"] = False
+			raise
+		finally:
+			if profiler is not None:
+				profiler.disable()
+				self._profiler = None
+			record["duration"] = time.perf_counter() - start_time
+			self._stack.pop()
+			self.update_record_by_configuration(
+				record=record,
+				configuration=configuration)
+			if profiler is not None:
+				record["path-to-profile"] = self.get_path_to_profile(
+					record=record)
+				profiler.dump_stats(
+					record["path-to-profile"])
+			self.emit(
+				record)
+
+	def update_counts(self, counts):
+		if len(self._stack) > 0:
+			self._stack[-1]["counts"].update(
+				counts)
+
+	def get_path_to_profile(self, record):
+		self._number_profiles += 1
+		path_to_profile = os.path.join(
+			self.path_to_profile_directory,
+			"{}-{}-{}-{}.prof".format(
+				record["stage"],
+				"unnamed" if record["name"] is None else record["name"],
+				record["process-id"],
+				self._number_profiles))
+		return path_to_profile
+
+	def get_summary(self):
+		## total duration and number of calls by stage, e.g. to attribute a slow batch to one stage
+		summary = dict()
+		for record in self.records:
+			stage_summary = summary.setdefault(
+				record["stage"],
+				{
+					"number-calls" : 0,
+					"total-duration" : 0.0,
+					"maximum-duration" : 0.0})
+			stage_summary["number-calls"] += 1
+			stage_summary["total-duration"] += record["duration"]
+			stage_summary["maximum-duration"] = max(
+				stage_summary["maximum-duration"],
+				record["duration"])
+		for stage_summary in summary.values():
+			stage_summary["mean-duration"] = stage_summary["total-duration"] / stage_summary["number-calls"]
+		return summary
+
+class InstrumentationConfiguration(BaseInstrumentationConfiguration):
+
+	def __init__(self):
+		super().__init__()
+
+	def initialize(self, sinks=None, profiled_stages=None, path_to_profile_directory=None):
+		if sinks is None:
+			sinks = list()
+		if profiled_stages is not None:
+			## "all" profiles the outermost stage of every call
+			if isinstance(profiled_stages, str):
+				if profiled_stages != "all":
+					profiled_stages = (profiled_stages,)
+			else:
+				profiled_stages = tuple(
+					profiled_stages)
+			if path_to_profile_directory is None:
+				path_to_profile_directory = os.getcwd()
+			if not isinstance(path_to_profile_directory, str):
+				raise ValueError("invalid type(path_to_profile_directory): {}".format(type(path_to_profile_directory)))
+			os.makedirs(
+				path_to_profile_directory,
+				exist_ok=True)
+		self._sinks = list()
+		for sink in sinks:
+			self.add_sink(
+				sink)
+		self._records = list()
+		self._profiled_stages = profiled_stages
+		self._path_to_profile_directory = path_to_profile_directory
+		self._stack = list()
+		self._profiler = None
+		self._number_profiles = 0
+
+##
@@ -0,0 +1,194 @@
+import numpy as np
+from contour_epicycles_configuration import ContourEpicyclesConfiguration
+from variable_order_configuration import MultipleContourEpicyclesConfiguration
+from plotter_base_configuration import BasePlotterConfiguration
+
+
+class BaseReconstructionMetricsConfiguration(BasePlotterConfiguration):
+
+	__slots__ = (
+		"_contour",
+		"_orders",
+		"_t_interp",
+		"_partial_sums",
+		"_metrics")
+
+	def __init__(self):
+		super().__init__()
+		self._contour = None
+		self._orders = None
+		self._t_interp = None
+		self._partial_sums = None
+		self._metrics = None
+
+	@property
+	def contour(self):
+		return self._contour
+
+	@property
+	def orders(self):
+		return self._orders
+
+	@property
+	def t_interp(self):
+		return self._t_interp
+
+	@property
+	def partial_sums(self):
+		return self._partial_sums
+
+	@property
+	def metrics(self):
+		return self._metrics
+
+	@staticmethod
+	def get_contour_epicycles_at_maximum_order(contour_epicycles):
+		## the coefficients at every order of a sweep are centered slices of those at the highest order
+		if isinstance(contour_epicycles, MultipleContourEpicyclesConfiguration):
+			if contour_epicycles.multiple_contour_epicycles is None:
+				raise ValueError("multiple_contour_epicycles is not initialized")
+			orders = np.copy(
+				contour_epicycles.variable_orders)
+			contour_epicycles_at_maximum_order = contour_epicycles.multiple_contour_epicycles[-1]
+		elif isinstance(contour_epicycles, ContourEpicyclesConfiguration):
+			## t_interp is set with the curve settings; the lazy curve itself is never needed here
+			if contour_epicycles.t_interp is None:
+				raise ValueError("t_interp is not initialized")
+			orders = np.arange(
+				1,
+				contour_epicycles.maximum_order + 1)
+			contour_epicycles_at_maximum_order = contour_epicycles
+		else:
+			raise ValueError("invalid type(contour_epicycles): {}".format(type(contour_epicycles)))
+		return orders, contour_epicycles_at_maximum_order
+
+	@staticmethod
+	def get_hausdorff_distances(partial_sums, contour_z):
+		## symmetric hausdorff distance between the sampled point sets of each reconstruction and of the contour
+		from scipy.spatial import cKDTree
+		contour_points = np.stack([
+			np.real(contour_z),
+			np.imag(contour_z)],
+			axis=1)
+		contour_tree = cKDTree(
+			contour_points)
+		reconstruction_points = np.stack([
+			np.real(partial_sums.reshape(-1)),
+			np.imag(partial_sums.reshape(-1))],
+			axis=1)
+		distances_to_contour, _ = contour_tree.query(
+			reconstruction_points,
+			workers=-1)
+		forward_distances = np.max(
+			distances_to_contour.reshape(partial_sums.shape),
+			axis=0)
+		backward_distances = np.full(
+			fill_value=np.nan,
+			shape=partial_sums.shape[1],
+			dtype=float)
+		for index_at_order in range(partial_sums.shape[1]):
+			reconstruction_tree = cKDTree(
+				reconstruction_points[index_at_order::partial_sums.shape[1]])
+			distances_to_reconstruction, _ = reconstruction_tree.query(
+				contour_points,
+				workers=-1)
+			backward_distances[index_at_order] = np.max(
+				distances_to_reconstruction)
+		hausdorff_distances = np.maximum(
+			forward_distances,
+			backward_distances)
+		return hausdorff_distances
+
+	def get_metrics(self, contour_epicycles, partial_sums, orders):
+		## the same deviations and errors as the order selection of the configuration
+		deviations = contour_epicycles.get_reconstruction_deviations(
+			partial_sums=partial_sums)
+		root_mean_square_errors = contour_epicycles.get_root_mean_square_errors(
+			deviations=deviations)
+		maximum_deviations = np.max(
+			deviations,
+			axis=0)
+		hausdorff_distances = self.get_hausdorff_distances(
+			partial_sums=partial_sums,
+			contour_z=contour_epicycles.contour.z)
+		metrics = {
+			"order" : orders,
+			"number-circles" : 2 * orders + 1,
+			"root-mean-square-error" : root_mean_square_errors,
+			"maximum-deviation" : maximum_deviations,
+			"hausdorff-distance" : hausdorff_distances}
+		return metrics
+
+	def get_table(self):
+		if self.metrics is None:
+			raise ValueError("metrics are not initialized")
+		names = list(
+			self.metrics.keys())
+		table = np.stack([
+			self.metrics[name]
+				for name in names],
+			axis=1)
+		return names, table
+
+	def save_metrics(self, path_to_file):
+		if not isinstance(path_to_file, str):
+			raise ValueError("invalid type(path_to_file): {}".format(type(path_to_file)))
+		if self.metrics is None:
+			raise ValueError("metrics are not initialized")
+		if path_to_file.endswith(".npz"):
+			np.savez(
+				path_to_file,
+				**{
+					name.replace("-", "_") : values
+						for name, values in self.metrics.items()})
+		elif path_to_file.endswith(".csv"):
+			names, table = self.get_table()
+			np.savetxt(
+				path_to_file,
+				table,
+				delimiter=",",
+				header=",".join(names),
+				comments="",
+				fmt=["%d", "%d", "%.10g", "%.10g", "%.10g"])
+		else:
+			raise ValueError("invalid path_to_file: {}; the extension should be '.csv' or '.npz'".format(path_to_file))
+
+class ReconstructionMetricsConfiguration(BaseReconstructionMetricsConfiguration):
+
+	__slots__ = ()
+
+	def __init__(self):
+		super().__init__()
+
+	def initialize(self, contour_epicycles, maximum_memory=2**27):
+		self.initialize_visual_settings()
+		orders, contour_epicycles_at_maximum_order = self.get_contour_epicycles_at_maximum_order(
+			contour_epicycles=contour_epicycles)
+		partial_sums = contour_epicycles_at_maximum_order.get_partial_sums(
+			complex_fourier_coefficients=contour_epicycles_at_maximum_order.complex_fourier_coefficients,
+			orders=orders,
+			t_interp=contour_epicycles_at_maximum_order.t_interp,
+			maximum_memory=maximum_memory)
+		metrics = self.get_metrics(
+			contour_epicycles=contour_epicycles_at_maximum_order,
+			partial_sums=partial_sums,
+			orders=orders)
+		self._contour = contour_epicycles_at_maximum_order.contour
+		self._orders = orders
+		self._t_interp = contour_epicycles_at_maximum_order.t_interp
+		self._partial_sums = partial_sums
+		self._metrics = metrics
+
+	def view_metrics(self, is_with_log_scale=True, figsize=None, is_save=False):
+		from plotter_configuration import ContourEpicyclesViewer
+		plotter = ContourEpicyclesViewer()
+		plotter.initialize_visual_settings()
+		plotter.update_save_directory(
+			path_to_save_directory=self.visual_settings.path_to_save_directory)
+		plotter.view_reconstruction_metrics(
+			reconstruction_metrics=self,
+			is_with_log_scale=is_with_log_scale,
+			figsize=figsize,
+			is_save=is_save)
+
+##
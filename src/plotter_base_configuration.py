@@ -3,6 +3,9 @@ from visual_settings_configuration import VisualSettingsConfiguration
 
 class BasePlotterConfiguration():
 
+	__slots__ = (
+		"_visual_settings",)
+
 	def __init__(self):
 		super().__init__()
 		self._visual_settings = None
@@ -1,11 +1,19 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
+from matplotlib.collections import LineCollection
 from plotter_base_configuration import BasePlotterConfiguration
+from frame_encoder_configuration import FrameEncoderConfiguration
+from instrumentation_configuration import instrument_stage
 
 
 class BaseContourEpicyclesViewer(BasePlotterConfiguration):
 
+	__slots__ = ()
+
 	def __init__(self):
 		super().__init__()
 
@@ -49,6 +57,69 @@ class BaseContourEpicyclesViewer(BasePlotterConfiguration):
 			alpha=alpha)
 		return ax, dft_handle
 
+	@staticmethod
+	def get_sorted_indices(maximum_order):
+		## c_0, c_1, c_-1, c_2, c_-2, ..., c_n, c_-n
+		positive_indices = maximum_order + np.arange(
+			1,
+			maximum_order + 1)
+		negative_indices = maximum_order - np.arange(
+			1,
+			maximum_order + 1)
+		sorted_indices = np.concatenate([
+			[maximum_order],
+			np.stack([
+				positive_indices,
+				negative_indices],
+				axis=1).reshape(-1)])
+		return sorted_indices
+
+	def get_epicycle_chain(self, contour_epicycles):
+		## centers[frame, i] is the center of the i-th circle at t_interp[frame];
+		## centers[frame, -1] is the tip of the chain that traces the epicycle path
+		sorted_indices = self.get_sorted_indices(
+			maximum_order=contour_epicycles.maximum_order)
+		## the chain is built in the precision of the stored coefficients
+		complex_coefficients = contour_epicycles.complex_fourier_coefficients[sorted_indices]
+		phasors = complex_coefficients * np.exp(
+			1j * np.outer(
+				contour_epicycles.t_interp,
+				contour_epicycles.orders[sorted_indices])).astype(
+					complex_coefficients.dtype,
+					copy=False)
+		centers = np.zeros(
+			shape=(contour_epicycles.t_interp.size, contour_epicycles.number_circles + 1),
+			dtype=complex_coefficients.dtype)
+		np.cumsum(
+			phasors,
+			axis=1,
+			out=centers[:, 1:])
+		radii = np.abs(
+			complex_coefficients)
+		return centers, radii
+
+	def get_group_epicycle_chain(self, contour_group):
+		## centers[contour, frame, i] as in get_epicycle_chain, for every contour in one batched product
+		sorted_indices = self.get_sorted_indices(
+			maximum_order=contour_group.maximum_order)
+		complex_coefficients = contour_group.complex_group_fourier_coefficients[:, sorted_indices]
+		exponentials = np.exp(
+			1j * np.outer(
+				contour_group.t_interp,
+				contour_group.orders[sorted_indices])).astype(
+					complex_coefficients.dtype,
+					copy=False)
+		centers = np.zeros(
+			shape=(contour_group.number_contours, contour_group.t_interp.size, contour_group.number_circles + 1),
+			dtype=complex_coefficients.dtype)
+		np.cumsum(
+			complex_coefficients[:, np.newaxis, :] * exponentials[np.newaxis, :, :],
+			axis=2,
+			out=centers[:, :, 1:])
+		radii = np.abs(
+			complex_coefficients).reshape(-1)
+		return centers, radii
+
 	@staticmethod
 	def get_contour_label():
 		label = "Contour of Image"
@@ -61,6 +132,14 @@ class BaseContourEpicyclesViewer(BasePlotterConfiguration):
 			contour_epicycles.number_circles)
 		return label
 
+	@staticmethod
+	def get_group_dft_label(contour_group):
+		label = "DFT\n" + r"${:,} \times (2 ({:,}) + 1) = {:,}$ Circles".format(
+			contour_group.number_contours,
+			contour_group.maximum_order,
+			contour_group.number_contours * contour_group.number_circles)
+		return label
+
 	def plot_legend(self, fig, ax):
 		handles, labels = ax.get_legend_handles_labels()
 		leg = self.visual_settings.get_legend(
@@ -70,6 +149,42 @@ class BaseContourEpicyclesViewer(BasePlotterConfiguration):
 			labels=labels)
 		return fig, ax, leg
 
+	@instrument_stage("display-animation")
+	def display_animation(self, fig, animate, frames, fargs, initialize_animation, is_blit, fps, save_name, extension, is_stream, codec, crf, pixel_format):
+		if not isinstance(is_stream, bool):
+			raise ValueError("invalid type(is_stream): {}".format(type(is_stream)))
+		modified_extensions = self.get_multiple_extensions(
+			extension=extension)
+		if is_stream and (save_name is not None):
+			## every frame is rasterized once and fed to one encoder per extension
+			self.visual_settings.stream_animation(
+				fig=fig,
+				animate=animate,
+				frames=frames,
+				fargs=fargs,
+				initialize_animation=initialize_animation,
+				is_blit=is_blit,
+				fps=fps,
+				save_name=save_name,
+				extension=modified_extensions,
+				codec=codec,
+				crf=crf,
+				pixel_format=pixel_format)
+		else:
+			anim = FuncAnimation(
+				fig,
+				animate,
+				init_func=initialize_animation,
+				fargs=fargs,
+				frames=frames,
+				blit=is_blit)
+			for modified_extension in modified_extensions:
+				self.visual_settings.display_animation(
+					anim=anim,
+					fps=fps,
+					save_name=save_name,
+					extension=modified_extension)
+
 	def autoformat_plot(self, contour_epicycles, ax, is_with_axes, limit_scale):
 		
 		def autoformat_axis_limits(contour_epicycles, ax, limit_scale):
@@ -162,9 +277,12 @@ class BaseContourEpicyclesViewer(BasePlotterConfiguration):
 
 class ContourEpicyclesViewer(BaseContourEpicyclesViewer):
 
+	__slots__ = ()
+
 	def __init__(self):
 		super().__init__()
 
+	@instrument_stage("view-image", configuration_name="contour_epicycles")
 	def view_image(self, contour_epicycles, is_show_contour, is_show_dft, is_with_axes, contour_color, dft_color, figsize, is_save):
 		self.verify_visual_settings()
 		if not isinstance(is_show_contour, bool):
@@ -221,15 +339,34 @@ class ContourEpicyclesViewer(BaseContourEpicyclesViewer):
 			fig=fig,
 			save_name=save_name)
 
-	def view_epicycles(self, contour_epicycles, fps, is_show_contour, is_show_dft, is_with_axes, contour_color, dft_color, curve_color, radius_color, circle_color, number_thetas, figsize, is_save, extension):
+	@instrument_stage("figure-setup", configuration_name="contour_epicycles")
+	def get_epicycles_animation(self, contour_epicycles, is_show_contour, is_show_dft, is_with_axes, contour_color, dft_color, curve_color, radius_color, circle_color, number_thetas, figsize, is_with_collections):
 
-		def plot_other_handles(contour_epicycles, curve_color, radius_color, circle_color):
+		def plot_other_handles(contour_epicycles, curve_color, radius_color, circle_color, is_with_collections):
 			curve_handle, = ax.plot(
 				list(),
 				list(),
 				color=curve_color,
 				label="Epicycle Path")
 			radius_handles, circle_handles = list(), list()
+			if is_with_collections:
+				## all radii form one polyline through the chain of centers
+				radius_handle, = ax.plot(
+					list(),
+					list(),
+					color=radius_color,
+					label="Radii")
+				circle_handle = LineCollection(
+					list(),
+					colors=circle_color,
+					label="Circles")
+				ax.add_collection(
+					circle_handle)
+				radius_handles.append(
+					radius_handle)
+				circle_handles.append(
+					circle_handle)
+				return curve_handle, radius_handles, circle_handles
 			for index_at_circle in range(contour_epicycles.number_circles):
 				if index_at_circle == 0:
 					radius_label = "Radii"
@@ -253,73 +390,96 @@ class ContourEpicyclesViewer(BaseContourEpicyclesViewer):
 					circle_handle)
 			return curve_handle, radius_handles, circle_handles
 
-		def get_sorted_fourier_coefficients(contour_epicycles, unsorted_coefficients):
-			## c_0, c_1, c_-1, c_2, c_-2, ..., c_n, c_-n
-			fourier_coefficients_at_t = list()
-			fourier_coefficients_at_t.append(
-				unsorted_coefficients[contour_epicycles.maximum_order])
-			for n in range(1, contour_epicycles.maximum_order):
-				nth_coefficients_at_t = [
-					unsorted_coefficients[contour_epicycles.maximum_order + n],
-					unsorted_coefficients[contour_epicycles.maximum_order - n]]
-				fourier_coefficients_at_t.extend(
-					nth_coefficients_at_t)
-			fourier_coefficients_at_t = np.array(
-				fourier_coefficients_at_t)
-			return fourier_coefficients_at_t
-	
-		def rotate_circles(contour_epicycles, t, thetas, x_curves, y_curves, curve_handle, radius_handles, circle_handles):
-			complex_coefficients = contour_epicycles.fourier_coefficients[:, 0] + 1j * contour_epicycles.fourier_coefficients[:, 1]
-			unsorted_coefficients = complex_coefficients * np.exp(
-				contour_epicycles.orders * t * 1j)
-			sorted_coefficients = get_sorted_fourier_coefficients(
-				contour_epicycles=contour_epicycles,
-				unsorted_coefficients=unsorted_coefficients)
-			real_component_at_coefficients = np.real(
-				sorted_coefficients)
-			imag_component_at_coefficients = np.imag(
-				sorted_coefficients)
-			center_position = np.full(
-				fill_value=0,
-				shape=len([
-					"x",
-					"y"]),
-				dtype=float)
-			(h, k) = center_position
-			for index_at_coefficient, x, y, z in zip(range(contour_epicycles.number_circles), real_component_at_coefficients, imag_component_at_coefficients, sorted_coefficients):
-				radius = np.abs(z)
-				circle_handles[index_at_coefficient].set_data(
-					h + radius * np.cos(thetas),
-					k + radius * np.sin(thetas))
-				radius_handles[index_at_coefficient].set_data(
-					[h, h + x],
-					[k, k + y])
-				h += x
-				k += y
-			x_curves.append(
-				h)
-			y_curves.append(
-				k)
+		def rotate_circles(frame, centers, x_circles, y_circles, curve_handle, radius_handles, circle_handles):
+			x_centers = np.real(
+				centers[frame])
+			y_centers = np.imag(
+				centers[frame])
+			for index_at_circle, (h, k) in enumerate(zip(x_centers[:-1], y_centers[:-1])):
+				circle_handles[index_at_circle].set_data(
+					h + x_circles[index_at_circle],
+					k + y_circles[index_at_circle])
+				radius_handles[index_at_circle].set_data(
+					x_centers[index_at_circle : index_at_circle + 2],
+					y_centers[index_at_circle : index_at_circle + 2])
 			curve_handle.set_data(
-				x_curves,
-				y_curves)
+				np.real(centers[:frame + 1, -1]),
+				np.imag(centers[:frame + 1, -1]))
 			handles = [
 				curve_handle,
 				*radius_handles,
 				*circle_handles]
 			return handles
 
-		def animate(frame, contour_epicycles, thetas, x_curves, y_curves, curve_handle, radius_handles, circle_handles):
-			t = contour_epicycles.t_interp[frame]
-			handles = rotate_circles(
-				contour_epicycles=contour_epicycles,
-				t=t,
-				thetas=thetas,
-				x_curves=x_curves,
-				y_curves=y_curves,
-				curve_handle=curve_handle,
-				radius_handles=radius_handles,
-				circle_handles=circle_handles)
+		def rotate_circle_collections(frame, centers, x_circles, y_circles, segments, curve_handle, radius_handles, circle_handles):
+			x_centers = np.real(
+				centers[frame])
+			y_centers = np.imag(
+				centers[frame])
+			np.add(
+				x_centers[:-1, np.newaxis],
+				x_circles,
+				out=segments[:, :, 0])
+			np.add(
+				y_centers[:-1, np.newaxis],
+				y_circles,
+				out=segments[:, :, 1])
+			circle_handles[0].set_segments(
+				segments)
+			radius_handles[0].set_data(
+				x_centers,
+				y_centers)
+			curve_handle.set_data(
+				np.real(centers[:frame + 1, -1]),
+				np.imag(centers[:frame + 1, -1]))
+			handles = [
+				curve_handle,
+				*radius_handles,
+				*circle_handles]
+			return handles
+
+		def initialize_animation():
+			curve_handle.set_data(
+				list(),
+				list())
+			for radius_handle in radius_handles:
+				radius_handle.set_data(
+					list(),
+					list())
+			for circle_handle in circle_handles:
+				if is_with_collections:
+					circle_handle.set_segments(
+						list())
+				else:
+					circle_handle.set_data(
+						list(),
+						list())
+			handles = [
+				curve_handle,
+				*radius_handles,
+				*circle_handles]
+			return handles
+
+		def animate(frame, centers, x_circles, y_circles, segments, curve_handle, radius_handles, circle_handles):
+			if segments is None:
+				handles = rotate_circles(
+					frame=frame,
+					centers=centers,
+					x_circles=x_circles,
+					y_circles=y_circles,
+					curve_handle=curve_handle,
+					radius_handles=radius_handles,
+					circle_handles=circle_handles)
+			else:
+				handles = rotate_circle_collections(
+					frame=frame,
+					centers=centers,
+					x_circles=x_circles,
+					y_circles=y_circles,
+					segments=segments,
+					curve_handle=curve_handle,
+					radius_handles=radius_handles,
+					circle_handles=circle_handles)
 			return handles
 
 		self.verify_visual_settings()
@@ -348,7 +508,8 @@ class ContourEpicyclesViewer(BaseContourEpicyclesViewer):
 			contour_epicycles=contour_epicycles,
 			curve_color=curve_color,
 			radius_color=radius_color,
-			circle_color=circle_color)
+			circle_color=circle_color,
+			is_with_collections=is_with_collections)
 		ax = self.autoformat_plot(
 			contour_epicycles=contour_epicycles,
 			ax=ax,
@@ -361,37 +522,201 @@ class ContourEpicyclesViewer(BaseContourEpicyclesViewer):
 			0,
 			contour_epicycles.tau,
 			number_thetas)
-		x_curves = list()
-		y_curves = list()
+		centers, radii = self.get_epicycle_chain(
+			contour_epicycles=contour_epicycles)
+		x_circles = np.outer(
+			radii,
+			np.cos(thetas))
+		y_circles = np.outer(
+			radii,
+			np.sin(thetas))
+		if is_with_collections:
+			segments = np.empty(
+				shape=(*x_circles.shape, 2),
+				dtype=float)
+		else:
+			segments = None
 		fargs = (
-			contour_epicycles,
-			thetas,
-			x_curves,
-			y_curves,
+			centers,
+			x_circles,
+			y_circles,
+			segments,
 			curve_handle,
 			radius_handles,
 			circle_handles)
-		anim = FuncAnimation(
-			fig,
-			animate,
+		return fig, animate, initialize_animation, fargs
+
+	@staticmethod
+	def render_epicycles_segment(contour_epicycles, animation_kwargs, frames, path_to_save_directory, save_name, extensions, fps, is_blit, codec, crf, pixel_format):
+		## runs in a worker process; the trail is rebuilt per frame from the precomputed chain, so
+		## any contiguous range of frames can be rendered independently of the others
+		plt.switch_backend(
+			"Agg")
+		plotter = ContourEpicyclesViewer()
+		plotter.initialize_visual_settings()
+		plotter.update_save_directory(
+			path_to_save_directory=path_to_save_directory)
+		fig, animate, initialize_animation, fargs = plotter.get_epicycles_animation(
+			contour_epicycles=contour_epicycles,
+			**animation_kwargs)
+		plotter.visual_settings.stream_animation(
+			fig=fig,
+			animate=animate,
+			frames=frames,
 			fargs=fargs,
-			frames=range(
-				contour_epicycles.number_time_steps))
+			initialize_animation=initialize_animation,
+			is_blit=is_blit,
+			fps=fps,
+			save_name=save_name,
+			extension=extensions,
+			codec=codec,
+			crf=crf,
+			pixel_format=pixel_format)
+		return save_name
+
+	@instrument_stage("display-animation-in-parallel", configuration_name="contour_epicycles")
+	def display_animation_in_parallel(self, contour_epicycles, animation_kwargs, number_processes, fps, save_name, extension, is_blit, codec, crf, pixel_format):
+		if not isinstance(number_processes, int):
+			raise ValueError("invalid type(number_processes): {}".format(type(number_processes)))
+		if number_processes <= 0:
+			raise ValueError("invalid number_processes: {}".format(number_processes))
+		modified_extensions = self.get_multiple_extensions(
+			extension=extension)
+		## segments are written losslessly and every format is encoded once while joining, so the
+		## output is the same as that of a serial render
+		segment_extensions = list()
+		for modified_extension in modified_extensions:
+			segment_extension = FrameEncoderConfiguration.get_segment_extension(
+				extension=modified_extension)
+			if segment_extension not in segment_extensions:
+				segment_extensions.append(
+					segment_extension)
+		chunks_of_frames = [
+			chunk_of_frames.tolist()
+				for chunk_of_frames in np.array_split(
+					np.arange(
+						contour_epicycles.number_time_steps),
+					min(
+						number_processes,
+						contour_epicycles.number_time_steps))]
+		## pending coefficients and curves are computed once here rather than in every worker
+		contour_epicycles.evaluate()
+		with tempfile.TemporaryDirectory(dir=self.visual_settings.path_to_save_directory) as path_to_segment_directory:
+			path_to_segment_directory = os.path.join(
+				path_to_segment_directory,
+				"")
+			with ProcessPoolExecutor(max_workers=number_processes) as executor:
+				futures = [
+					executor.submit(
+						self.render_epicycles_segment,
+						contour_epicycles,
+						animation_kwargs,
+						chunk_of_frames,
+						path_to_segment_directory,
+						"segment-{:05d}".format(index_at_chunk),
+						segment_extensions,
+						fps,
+						is_blit,
+						None,
+						None,
+						None)
+							for index_at_chunk, chunk_of_frames in enumerate(chunks_of_frames)]
+				segment_names = [
+					future.result()
+						for future in futures]
+			for modified_extension in modified_extensions:
+				segment_extension = FrameEncoderConfiguration.get_segment_extension(
+					extension=modified_extension)
+				paths_to_segments = [
+					"{}{}{}".format(path_to_segment_directory, segment_name, segment_extension)
+						for segment_name in segment_names]
+				save_path = self.visual_settings.get_save_path(
+					save_name=save_name,
+					default_extension=".mp4",
+					extension=modified_extension)
+				FrameEncoderConfiguration.concatenate_segments(
+					paths_to_segments=paths_to_segments,
+					save_path=save_path,
+					extension=modified_extension,
+					durations=[
+						len(chunk_of_frames) / fps
+							for chunk_of_frames in chunks_of_frames],
+					codec=self.visual_settings.get_value_by_extension(
+						value=codec,
+						extension=modified_extension),
+					crf=self.visual_settings.get_value_by_extension(
+						value=crf,
+						extension=modified_extension),
+					pixel_format=self.visual_settings.get_value_by_extension(
+						value=pixel_format,
+						extension=modified_extension))
+
+	@instrument_stage("view-epicycles", configuration_name="contour_epicycles")
+	def view_epicycles(self, contour_epicycles, fps, is_show_contour, is_show_dft, is_with_axes, contour_color, dft_color, curve_color, radius_color, circle_color, number_thetas, figsize, is_save, extension, is_with_collections=False, is_blit=False, is_stream=False, codec=None, crf=None, pixel_format=None, number_processes=None):
+		self.verify_visual_settings()
+		animation_kwargs = {
+			"is_show_contour" : is_show_contour,
+			"is_show_dft" : is_show_dft,
+			"is_with_axes" : is_with_axes,
+			"contour_color" : contour_color,
+			"dft_color" : dft_color,
+			"curve_color" : curve_color,
+			"radius_color" : radius_color,
+			"circle_color" : circle_color,
+			"number_thetas" : number_thetas,
+			"figsize" : figsize,
+			"is_with_collections" : is_with_collections}
 		save_name = self.get_save_name(
 			contour_epicycles=contour_epicycles,
 			plot_name="Epicycles",
 			is_save=is_save)
-		modified_extensions = self.get_multiple_extensions(
-			extension=extension)
-		for modified_extension in modified_extensions:
-			self.visual_settings.display_animation(
-				anim=anim,
+		if (number_processes is not None) and (save_name is not None):
+			self.display_animation_in_parallel(
+				contour_epicycles=contour_epicycles,
+				animation_kwargs=animation_kwargs,
+				number_processes=number_processes,
 				fps=fps,
 				save_name=save_name,
-				extension=modified_extension)
+				extension=extension,
+				is_blit=is_blit,
+				codec=codec,
+				crf=crf,
+				pixel_format=pixel_format)
+		else:
+			fig, animate, initialize_animation, fargs = self.get_epicycles_animation(
+				contour_epicycles=contour_epicycles,
+				**animation_kwargs)
+			frames = range(
+				contour_epicycles.number_time_steps)
+			self.display_animation(
+				fig=fig,
+				animate=animate,
+				frames=frames,
+				fargs=fargs,
+				initialize_animation=initialize_animation,
+				is_blit=is_blit,
+				fps=fps,
+				save_name=save_name,
+				extension=extension,
+				is_stream=is_stream,
+				codec=codec,
+				crf=crf,
+				pixel_format=pixel_format)
+
+	@instrument_stage("view-variable-order", configuration_name="multiple_contour_epicycles")
+	def view_variable_order(self, multiple_contour_epicycles, fps, is_show_contour, is_with_axes, contour_color, dft_color, figsize, is_save, extension, is_blit=False, is_stream=False, codec=None, crf=None, pixel_format=None):
+
+		def initialize_animation():
+			dft_handle.set_data(
+				list(),
+				list())
+			text_handle.set_text(
+				"")
+			handles = [
+				dft_handle,
+				text_handle]
+			return handles
 
-	def view_variable_order(self, multiple_contour_epicycles, fps, is_show_contour, is_with_axes, contour_color, dft_color, figsize, is_save, extension):
-		
 		def animate(frame, multiple_contour_epicycles, dft_handle, text_handle):
 			contour_epicycles = multiple_contour_epicycles.multiple_contour_epicycles[frame]
 			dft_handle.set_data(
@@ -444,23 +769,222 @@ class ContourEpicyclesViewer(BaseContourEpicyclesViewer):
 			multiple_contour_epicycles,
 			dft_handle,
 			text_handle,)
-		anim = FuncAnimation(
-			fig,
-			animate,
-			fargs=fargs,
-			frames=range(
-				multiple_contour_epicycles.variable_orders.size))
+		frames = range(
+			multiple_contour_epicycles.variable_orders.size)
 		save_name = self.get_save_name(
 			contour_epicycles=multiple_contour_epicycles,
 			plot_name="Variable Order",
 			is_save=is_save)
-		modified_extensions = self.get_multiple_extensions(
-			extension=extension)
-		for modified_extension in modified_extensions:
-			self.visual_settings.display_animation(
-				anim=anim,
-				fps=fps,
-				save_name=save_name,
-				extension=modified_extension)
+		self.display_animation(
+			fig=fig,
+			animate=animate,
+			frames=frames,
+			fargs=fargs,
+			initialize_animation=initialize_animation,
+			is_blit=is_blit,
+			fps=fps,
+			save_name=save_name,
+			extension=extension,
+			is_stream=is_stream,
+			codec=codec,
+			crf=crf,
+			pixel_format=pixel_format)
+
+	@instrument_stage("view-contour-group", configuration_name="contour_group")
+	def view_contour_group(self, contour_group, fps, is_show_contour, is_show_dft, is_with_axes, contour_color, dft_color, curve_color, radius_color, circle_color, number_thetas, figsize, is_save, extension, is_blit=False, is_stream=False, codec=None, crf=None, pixel_format=None):
+
+		def get_broken_line(points):
+			## a column of nan after every contour breaks one line artist into one piece per contour
+			broken_points = np.concatenate([
+				points,
+				np.full(
+					fill_value=np.nan + 1j * np.nan,
+					shape=(points.shape[0], 1))],
+				axis=1).reshape(-1)
+			return np.real(broken_points), np.imag(broken_points)
+
+		def initialize_animation():
+			curve_handle.set_data(
+				list(),
+				list())
+			radius_handle.set_data(
+				list(),
+				list())
+			circle_handle.set_segments(
+				list())
+			handles = [
+				curve_handle,
+				radius_handle,
+				circle_handle]
+			return handles
+
+		def animate(frame, centers, x_circles, y_circles, segments, curve_handle, radius_handle, circle_handle):
+			frame_centers = centers[:, frame, :]
+			np.add(
+				np.real(frame_centers[:, :-1]).reshape(-1, 1),
+				x_circles,
+				out=segments[:, :, 0])
+			np.add(
+				np.imag(frame_centers[:, :-1]).reshape(-1, 1),
+				y_circles,
+				out=segments[:, :, 1])
+			circle_handle.set_segments(
+				segments)
+			radius_handle.set_data(
+				*get_broken_line(
+					frame_centers))
+			curve_handle.set_data(
+				*get_broken_line(
+					centers[:, :frame + 1, -1]))
+			handles = [
+				curve_handle,
+				radius_handle,
+				circle_handle]
+			return handles
+
+		self.verify_visual_settings()
+		fig, ax = plt.subplots(
+			figsize=figsize)
+		ax.set_aspect(
+			"equal")
+		for index_at_contour, contour_epicycles in enumerate(contour_group.multiple_contour_epicycles):
+			if index_at_contour == 0:
+				contour_label = self.get_contour_label()
+				dft_label = self.get_group_dft_label(
+					contour_group=contour_group)
+			else:
+				contour_label = None
+				dft_label = None
+			if is_show_contour:
+				ax, contour_handle = self.plot_contour(
+					contour_epicycles=contour_epicycles,
+					ax=ax,
+					contour_color=contour_color,
+					label=contour_label,
+					alpha=0.5)
+			if is_show_dft:
+				ax, dft_handle = self.plot_discrete_fourier_transform(
+					contour_epicycles=contour_epicycles,
+					ax=ax,
+					dft_color=dft_color,
+					label=dft_label,
+					alpha=0.5)
+		## one artist per element for the whole group, however many contours there are
+		curve_handle, = ax.plot(
+			list(),
+			list(),
+			color=curve_color,
+			label="Epicycle Path")
+		radius_handle, = ax.plot(
+			list(),
+			list(),
+			color=radius_color,
+			label="Radii")
+		circle_handle = LineCollection(
+			list(),
+			colors=circle_color,
+			label="Circles")
+		ax.add_collection(
+			circle_handle)
+		ax = self.autoformat_plot(
+			contour_epicycles=contour_group,
+			ax=ax,
+			is_with_axes=is_with_axes,
+			limit_scale=1.375)
+		fig, ax, leg = self.plot_legend(
+			fig=fig,
+			ax=ax)
+		thetas = np.linspace(
+			0,
+			contour_group.tau,
+			number_thetas)
+		centers, radii = self.get_group_epicycle_chain(
+			contour_group=contour_group)
+		x_circles = np.outer(
+			radii,
+			np.cos(thetas))
+		y_circles = np.outer(
+			radii,
+			np.sin(thetas))
+		segments = np.empty(
+			shape=(*x_circles.shape, 2),
+			dtype=float)
+		fargs = (
+			centers,
+			x_circles,
+			y_circles,
+			segments,
+			curve_handle,
+			radius_handle,
+			circle_handle)
+		frames = range(
+			contour_group.number_time_steps)
+		save_name = self.get_save_name(
+			contour_epicycles=contour_group,
+			plot_name="Contour Group Epicycles",
+			is_save=is_save)
+		self.display_animation(
+			fig=fig,
+			animate=animate,
+			frames=frames,
+			fargs=fargs,
+			initialize_animation=initialize_animation,
+			is_blit=is_blit,
+			fps=fps,
+			save_name=save_name,
+			extension=extension,
+			is_stream=is_stream,
+			codec=codec,
+			crf=crf,
+			pixel_format=pixel_format)
+
+	@instrument_stage("view-reconstruction-metrics", configuration_name="reconstruction_metrics")
+	def view_reconstruction_metrics(self, reconstruction_metrics, is_with_log_scale, figsize, is_save):
+		self.verify_visual_settings()
+		if not isinstance(is_with_log_scale, bool):
+			raise ValueError("invalid type(is_with_log_scale): {}".format(type(is_with_log_scale)))
+		string_mapping = {
+			"root-mean-square-error" : {
+				"label" : "RMS Error",
+				"color" : "steelblue"},
+			"maximum-deviation" : {
+				"label" : "Maximum Deviation",
+				"color" : "darkorange"},
+			"hausdorff-distance" : {
+				"label" : "Hausdorff Distance",
+				"color" : "limegreen"}}
+		fig, ax = plt.subplots(
+			figsize=figsize)
+		for name, mapping in string_mapping.items():
+			ax.plot(
+				reconstruction_metrics.metrics["order"],
+				reconstruction_metrics.metrics[name],
+				color=mapping["color"],
+				label=mapping["label"],
+				marker=".")
+		if is_with_log_scale:
+			ax.set_yscale(
+				"log")
+		ax = self.visual_settings.autoformat_grid(
+			ax=ax,
+			grid_color="gray")
+		modified_name = reconstruction_metrics.contour.name.replace(
+			"_",
+			" ")
+		ax = self.visual_settings.autoformat_axis_labels(
+			ax=ax,
+			xlabel="Maximum Order",
+			ylabel="Error (pixels)",
+			title=modified_name.title())
+		fig, ax, leg = self.plot_legend(
+			fig=fig,
+			ax=ax)
+		save_name = self.get_save_name(
+			contour_epicycles=reconstruction_metrics,
+			plot_name="Reconstruction Metrics",
+			is_save=is_save)
+		self.visual_settings.display_image(
+			fig=fig,
+			save_name=save_name)
 
 ##
\ No newline at end of file
@@ -0,0 +1,207 @@
+import os
+import sys
+import argparse
+from batch_configuration import BatchConfiguration
+
+
+def get_parser():
+	parser = argparse.ArgumentParser(
+		description="Render contour epicycles for every image in a directory or glob across a process pool.")
+	parser.add_argument(
+		"path_to_images",
+		help="directory of images or glob pattern, e.g. 'data/*.png'")
+	parser.add_argument(
+		"path_to_save_directory",
+		help="directory in which the plots and animations are saved")
+	parser.add_argument(
+		"--views",
+		nargs="+",
+		default=["epicycles"],
+		choices=["contour", "dft", "epicycles", "variable-order"])
+	parser.add_argument(
+		"--number-processes",
+		type=int,
+		default=None,
+		help="size of the process pool (default: number of cores)")
+	parser.add_argument(
+		"--threshold",
+		type=float,
+		default=0.5)
+	parser.add_argument(
+		"--index-at-contour",
+		type=int,
+		default=0)
+	parser.add_argument(
+		"--minimum-order",
+		type=int,
+		default=1)
+	parser.add_argument(
+		"--maximum-order",
+		type=int,
+		default=100)
+	parser.add_argument(
+		"--number-time-steps",
+		type=int,
+		default=1080)
+	parser.add_argument(
+		"--method",
+		default="fft",
+		choices=["quad", "fft", "polyline"])
+	parser.add_argument(
+		"--parameterization",
+		default="index",
+		choices=["index", "arc-length"])
+	parser.add_argument(
+		"--alpha-mode",
+		default="mean",
+		choices=["mean", "mask", "ignore"],
+		help="how the alpha channel enters the grayscale image")
+	parser.add_argument(
+		"--maximum-pixels",
+		type=int,
+		default=None,
+		help="reduce larger images to about this many pixels while decoding")
+	parser.add_argument(
+		"--selection",
+		default="index",
+		choices=["index", "length", "area", "point"],
+		help="pick the contour by index, or trace only the region with the longest perimeter, the largest area or the one containing --point-at-contour")
+	parser.add_argument(
+		"--point-at-contour",
+		type=float,
+		nargs=2,
+		default=None,
+		metavar=("X", "Y"),
+		help="pixel (column, row) inside the region to trace when --selection point")
+	parser.add_argument(
+		"--simplification-tolerance",
+		type=float,
+		default=None,
+		help="simplify the contour to within this many pixels (ramer-douglas-peucker)")
+	parser.add_argument(
+		"--number-contour-points",
+		type=int,
+		default=None,
+		help="resample the contour to this many points")
+	parser.add_argument(
+		"--energy-fraction",
+		type=float,
+		default=None,
+		help="use the smallest order up to --maximum-order that retains this fraction of the energy")
+	parser.add_argument(
+		"--maximum-error",
+		type=float,
+		default=None,
+		help="use the smallest order up to --maximum-order with at most this root-mean-square error in pixels")
+	parser.add_argument(
+		"--precision",
+		default="double",
+		choices=["double", "single"],
+		help="store the coefficients and curves as complex128 (double) or complex64 (single)")
+	parser.add_argument(
+		"--fps",
+		type=int,
+		default=60)
+	parser.add_argument(
+		"--figsize",
+		type=float,
+		nargs=2,
+		default=[12, 7])
+	parser.add_argument(
+		"--extension",
+		nargs="+",
+		default=[".mp4"])
+	parser.add_argument(
+		"--without-axes",
+		action="store_true")
+	parser.add_argument(
+		"--without-collections",
+		action="store_true")
+	parser.add_argument(
+		"--without-blit",
+		action="store_true")
+	parser.add_argument(
+		"--without-stream",
+		action="store_true")
+	parser.add_argument(
+		"--path-to-timings",
+		default=None,
+		help="append one json line per timed stage (contour, coefficients, synthesis, figure setup, drawing and encoding) to this file")
+	parser.add_argument(
+		"--profiled-stages",
+		nargs="+",
+		default=None,
+		help="dump a cProfile of these stages (or 'all') to --path-to-profile-directory")
+	parser.add_argument(
+		"--path-to-profile-directory",
+		default=None)
+	return parser
+
+
+if __name__ == "__main__":
+
+	args = get_parser().parse_args()
+	path_to_save_directory = os.path.join(
+		args.path_to_save_directory,
+		"")
+	os.makedirs(
+		path_to_save_directory,
+		exist_ok=True)
+	batch = BatchConfiguration()
+	batch.initialize(
+		path_to_images=args.path_to_images,
+		number_processes=args.number_processes)
+	results = batch.run(
+		path_to_save_directory=path_to_save_directory,
+		views=args.views,
+		threshold=args.threshold,
+		index_at_contour=args.index_at_contour,
+		minimum_order=args.minimum_order,
+		maximum_order=args.maximum_order,
+		number_time_steps=args.number_time_steps,
+		method=args.method,
+		parameterization=args.parameterization,
+		alpha_mode=args.alpha_mode,
+		maximum_pixels=args.maximum_pixels,
+		selection=args.selection,
+		point_at_contour=args.point_at_contour,
+		simplification_tolerance=args.simplification_tolerance,
+		number_contour_points=args.number_contour_points,
+		energy_fraction=args.energy_fraction,
+		maximum_error=args.maximum_error,
+		fps=args.fps,
+		figsize=tuple(args.figsize),
+		extension=args.extension,
+		is_with_axes=not args.without_axes,
+		is_with_collections=not args.without_collections,
+		is_blit=not args.without_blit,
+		is_stream=not args.without_stream,
+		path_to_timings=args.path_to_timings,
+		profiled_stages=None if args.profiled_stages is None else ("all" if args.profiled_stages == ["all"] else args.profiled_stages),
+		path_to_profile_directory=args.path_to_profile_directory,
+		precision=args.precision)
+	for result in results:
+		status = "ok" if result["is-success"] else "FAILED"
+		if result["maximum-order"] is not None:
+			print("{:<8}{:>9.2f} s  {}  (maximum_order={:,})".format(status, result["duration"], result["path-to-image"], result["maximum-order"]))
+		else:
+			print("{:<8}{:>9.2f} s  {}".format(status, result["duration"], result["path-to-image"]))
+		if not result["is-success"]:
+			print(result["error"])
+	summary = batch.get_summary()
+	print("{:,} of {:,} images succeeded on {:,} processes in {:.2f} s ({:.2f} images per minute)".format(
+		summary["number-successes"],
+		summary["number-images"],
+		summary["number-processes"],
+		summary["elapsed-time"],
+		summary["images-per-minute"]))
+	stage_durations = batch.get_stage_durations()
+	for stage, stage_duration in stage_durations.items():
+		print("{:<36}{:>9.2f} s over {:,} calls".format(
+			stage,
+			stage_duration["total-duration"],
+			stage_duration["number-calls"]))
+	if summary["number-failures"] > 0:
+		sys.exit(1)
+
+##
@@ -0,0 +1,146 @@
+import os
+import sys
+import argparse
+from benchmark_configuration import BenchmarkConfiguration
+
+
+def get_parser():
+	parser = argparse.ArgumentParser(
+		description="Benchmark each pipeline stage over a directory or glob of images, or compare two benchmark results.")
+	subparsers = parser.add_subparsers(
+		dest="command",
+		required=True)
+	run_parser = subparsers.add_parser(
+		"run",
+		help="benchmark every stage and save the results as json")
+	run_parser.add_argument(
+		"path_to_results",
+		help="json file in which the results are saved")
+	run_parser.add_argument(
+		"--path-to-images",
+		default=os.path.join(
+			os.path.dirname(os.path.abspath(__file__)),
+			os.pardir,
+			"data"),
+		help="directory of images or glob pattern (default: the bundled data directory)")
+	run_parser.add_argument(
+		"--maximum-orders",
+		type=int,
+		nargs="+",
+		default=[10, 100])
+	run_parser.add_argument(
+		"--numbers-time-steps",
+		type=int,
+		nargs="+",
+		default=[100, 500])
+	run_parser.add_argument(
+		"--stages",
+		nargs="+",
+		default=list(BenchmarkConfiguration.get_stages()),
+		choices=BenchmarkConfiguration.get_stages())
+	run_parser.add_argument(
+		"--threshold",
+		type=float,
+		default=0.5)
+	run_parser.add_argument(
+		"--index-at-contour",
+		type=int,
+		default=0)
+	run_parser.add_argument(
+		"--coefficient-method",
+		default="fft",
+		choices=["quad", "fft", "polyline"])
+	run_parser.add_argument(
+		"--dft-method",
+		default="fft",
+		choices=["loop", "matrix", "fft"])
+	run_parser.add_argument(
+		"--fps",
+		type=int,
+		default=60)
+	run_parser.add_argument(
+		"--number-repeats",
+		type=int,
+		default=3,
+		help="timed repeats per stage; the fastest is recorded")
+	run_parser.add_argument(
+		"--number-render-repeats",
+		type=int,
+		default=1)
+	compare_parser = subparsers.add_parser(
+		"compare",
+		help="compare a candidate run against a baseline run and flag regressions")
+	compare_parser.add_argument(
+		"path_to_baseline_results")
+	compare_parser.add_argument(
+		"path_to_candidate_results")
+	compare_parser.add_argument(
+		"--tolerance",
+		type=float,
+		default=0.1,
+		help="relative change beyond which a metric is flagged (default: 0.1)")
+	compare_parser.add_argument(
+		"--minimum-wall-time",
+		type=float,
+		default=1e-3,
+		help="wall times that change by less than this many seconds are never flagged")
+	return parser
+
+
+if __name__ == "__main__":
+
+	args = get_parser().parse_args()
+	benchmark = BenchmarkConfiguration()
+	if args.command == "run":
+		benchmark.initialize(
+			path_to_images=args.path_to_images,
+			maximum_orders=args.maximum_orders,
+			numbers_time_steps=args.numbers_time_steps,
+			stages=args.stages)
+		results = benchmark.run(
+			threshold=args.threshold,
+			index_at_contour=args.index_at_contour,
+			coefficient_method=args.coefficient_method,
+			dft_method=args.dft_method,
+			fps=args.fps,
+			number_repeats=args.number_repeats,
+			number_render_repeats=args.number_render_repeats,
+			is_verbose=True)
+		benchmark.save_results(
+			path_to_file=args.path_to_results)
+		print("{:,} records from {:,} images in {:.2f} s saved to {}".format(
+			len(results["records"]),
+			len(benchmark.paths_to_images),
+			results["metadata"]["elapsed-time"],
+			args.path_to_results))
+	else:
+		comparison_summary = benchmark.get_comparison(
+			baseline_results=benchmark.load_results(
+				path_to_file=args.path_to_baseline_results),
+			candidate_results=benchmark.load_results(
+				path_to_file=args.path_to_candidate_results),
+			tolerance=args.tolerance,
+			minimum_wall_time=args.minimum_wall_time)
+		for comparison in comparison_summary["comparisons"]:
+			if comparison["is-regression"]:
+				ratios = ", ".join(
+					"{} x{:.2f}".format(metric_name, comparison["{}-ratio".format(metric_name)])
+						for metric_name in comparison["regressions"])
+				print("REGRESSION  {:<16}{:<28}{:>6}{:>7}  {}".format(
+					os.path.basename(comparison["path-to-image"]),
+					comparison["stage"],
+					"" if comparison["maximum-order"] is None else comparison["maximum-order"],
+					"" if comparison["number-time-steps"] is None else comparison["number-time-steps"],
+					ratios))
+		if len(comparison_summary["metadata-differences"]) > 0:
+			print("the runs differ in: {}".format(
+				", ".join(comparison_summary["metadata-differences"])))
+		print("{:,} regressions in {:,} comparisons at tolerance {:.0%} ({:,} unmatched records)".format(
+			comparison_summary["number-regressions"],
+			comparison_summary["number-comparisons"],
+			comparison_summary["tolerance"],
+			comparison_summary["number-unmatched-records"]))
+		if comparison_summary["number-regressions"] > 0:
+			sys.exit(1)
+
+##
@@ -1,12 +1,16 @@
 import numpy as np
+from instrumentation_configuration import instrument_stage
 from contour_epicycles_configuration import (
 	ContourEpicyclesConfiguration,
-	BaseContourEpicyclesConfiguration,
-	ContourEpicyclesViewer)
+	BaseContourEpicyclesConfiguration)
 
 
 class BaseMultipleContourEpicyclesConfiguration(BaseContourEpicyclesConfiguration):
 
+	__slots__ = (
+		"_variable_orders",
+		"_multiple_contour_epicycles")
+
 	def __init__(self):
 		super().__init__()
 		self._variable_orders = None
@@ -52,9 +56,36 @@ class BaseMultipleContourEpicyclesConfiguration(BaseContourEpicyclesConfiguratio
 					maximum_order + 1)))
 		self._variable_orders = variable_orders
 
-	def initialize_multiple_contour_epicycles(self, number_time_steps):
+	@instrument_stage("multiple-contour-epicycles")
+	def initialize_multiple_contour_epicycles(self, number_time_steps, method="quad", is_cache=False):
+		## coefficients at lower orders are a centered slice of those at the highest order,
+		## so the curves at every order are the partial sums of one set of coefficients;
+		## they are rows of one contiguous array
+		full_contour_epicycles = ContourEpicyclesConfiguration()
+		full_contour_epicycles._contour = self.contour
+		full_contour_epicycles._tau = self.tau
+		full_contour_epicycles._t = self.t
+		full_contour_epicycles.initialize_orders(
+			maximum_order=int(
+				np.max(
+					self.variable_orders)))
+		full_contour_epicycles._precision = self.precision
+		full_contour_epicycles.initialize_fourier_coefficients(
+			method=method,
+			is_cache=is_cache)
+		t_interp = full_contour_epicycles.get_t_interp(
+			number_time_steps=number_time_steps)
+		index_at_zero = full_contour_epicycles.maximum_order
+		z = full_contour_epicycles.complex_fourier_coefficients
+		partial_sums = full_contour_epicycles.get_partial_sums(
+			complex_fourier_coefficients=z,
+			orders=self.variable_orders,
+			t_interp=t_interp)
+		discrete_fourier_transforms = np.ascontiguousarray(
+			partial_sums.T,
+			dtype=self.get_precision_dtype())
 		multiple_contour_epicycles = list()
-		for maximum_order in self.variable_orders:
+		for index_at_order, maximum_order in enumerate(self.variable_orders):
 			contour_epicycles = ContourEpicyclesConfiguration()
 			contour_epicycles.initialize_visual_settings()
 			contour_epicycles._contour = self.contour
@@ -62,38 +93,51 @@ class BaseMultipleContourEpicyclesConfiguration(BaseContourEpicyclesConfiguratio
 			contour_epicycles._t = self.t
 			contour_epicycles.initialize_orders(
 				maximum_order=maximum_order)
-			contour_epicycles.initialize_fourier_coefficients()
-			contour_epicycles.initialize_discrete_fourier_transform(
-				number_time_steps=number_time_steps)
+			contour_epicycles._precision = self.precision
+			contour_epicycles._fourier_coefficients = z[index_at_zero - maximum_order : index_at_zero + maximum_order + 1]
+			contour_epicycles._fourier_coefficient_method = method
+			contour_epicycles._t_interp = t_interp
+			contour_epicycles._discrete_fourier_transform = discrete_fourier_transforms[index_at_order]
+			contour_epicycles._number_time_steps = number_time_steps
 			multiple_contour_epicycles.append(
 				contour_epicycles)
 		self._multiple_contour_epicycles = multiple_contour_epicycles
 
 class MultipleContourEpicyclesConfiguration(BaseMultipleContourEpicyclesConfiguration):
 
+	__slots__ = ()
+
 	def __init__(self):
 		super().__init__()
 
-	def initialize(self, path_to_image, minimum_order=1, maximum_order=100, number_time_steps=500, threshold=0.5, index_at_contour=0):
+	@instrument_stage("variable-order")
+	def initialize(self, path_to_image, minimum_order=1, maximum_order=100, number_time_steps=500, threshold=0.5, index_at_contour=0, method="quad", parameterization="index", alpha_mode="mean", maximum_pixels=None, selection="index", point_at_contour=None, simplification_tolerance=None, number_contour_points=None, precision="double", is_cache_contour=True, is_cache_fourier=True):
 		self.initialize_visual_settings()
 		self.initialize_contour(
 			path_to_image=path_to_image,
 			threshold=threshold,
-			index_at_contour=index_at_contour)
-		self.initialize_t()
-		self.initialize_visual_settings()
-		self.initialize_contour(
-			path_to_image=path_to_image,
-			threshold=threshold,
-			index_at_contour=index_at_contour)
+			index_at_contour=index_at_contour,
+			parameterization=parameterization,
+			alpha_mode=alpha_mode,
+			maximum_pixels=maximum_pixels,
+			selection=selection,
+			point_at_contour=point_at_contour,
+			simplification_tolerance=simplification_tolerance,
+			number_contour_points=number_contour_points,
+			is_cache_contour=is_cache_contour)
 		self.initialize_t()
 		self.initialize_variable_orders(
 			minimum_order=minimum_order,
 			maximum_order=maximum_order)
+		self.initialize_precision(
+			precision=precision)
 		self.initialize_multiple_contour_epicycles(
-			number_time_steps=number_time_steps)
+			number_time_steps=number_time_steps,
+			method=method,
+			is_cache=is_cache_fourier)
 
-	def view_variable_order(self, fps=60, is_show_contour=False, is_with_axes=False, contour_color="black", dft_color="darkorange", figsize=None, is_save=False, extension=".mp4"):
+	def view_variable_order(self, fps=60, is_show_contour=False, is_with_axes=False, contour_color="black", dft_color="darkorange", figsize=None, is_save=False, extension=".mp4", is_blit=False, is_stream=False, codec=None, crf=None, pixel_format=None):
+		from plotter_configuration import ContourEpicyclesViewer
 		plotter = ContourEpicyclesViewer()
 		plotter.initialize_visual_settings()
 		plotter.update_save_directory(
@@ -107,6 +151,11 @@ class MultipleContourEpicyclesConfiguration(BaseMultipleContourEpicyclesConfigur
 			dft_color=dft_color,
 			figsize=figsize,
 			is_save=is_save,
-			extension=extension)
+			extension=extension,
+			is_blit=is_blit,
+			is_stream=is_stream,
+			codec=codec,
+			crf=crf,
+			pixel_format=pixel_format)
 
 ##
\ No newline at end of file
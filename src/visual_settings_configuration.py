@@ -1,7 +1,7 @@
+import time
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
-from matplotlib.colors import Normalize, ListedColormap, BoundaryNorm
+from frame_encoder_configuration import FrameEncoderConfiguration
+from instrumentation_configuration import instrument_stage, update_stage_counts
 
 
 class BaseVisualSettingsConfiguration():
@@ -124,6 +124,7 @@ class VisualAxesConfiguration(BaseVisualSettingsConfiguration):
 		return ax
 
 	def set_axis_ticks_and_ticklabels_by_dimension(self, ax, dimension, major_ticks=None, minor_ticks=None, major_ticklabels=None, minor_ticklabels=None, major_fmt=None, minor_fmt=None):
+		import matplotlib.ticker as ticker
 		keys = [
 			"x",
 			"y",
@@ -317,6 +318,7 @@ class VisualColorsConfiguration(VisualAxesConfiguration):
 
 	@staticmethod
 	def get_rgb_facecolors_from_cmap(cmap, norm, vector):
+		import matplotlib.pyplot as plt
 		f_cmap = plt.cm.get_cmap(
 			cmap)
 		rgb_facecolors = f_cmap(
@@ -325,6 +327,7 @@ class VisualColorsConfiguration(VisualAxesConfiguration):
 		return rgb_facecolors
 
 	def get_rgb_facecolors(self, number_colors, facecolors=None, cmap=None):
+		from matplotlib.colors import Normalize, ListedColormap, BoundaryNorm
 		if (cmap is None) and (facecolors is None):
 			raise ValueError("cmap=None and facecolors=None is not a valid combination")
 		if (cmap is not None) and (facecolors is not None):
@@ -608,7 +611,9 @@ class VisualSettingsConfiguration(VisualColorBarConfiguration):
 				raise ValueError("invalid type(path_to_save_directory): {}".format(type(path_to_save_directory)))
 		self._path_to_save_directory = path_to_save_directory
 
+	@instrument_stage("save-image")
 	def display_image(self, fig, save_name=None, dpi=800, bbox_inches="tight", pad_inches=0.1, extension=None, space_replacement=None, **kwargs):
+		import matplotlib.pyplot as plt
 		if save_name is None:
 			plt.show()
 		elif isinstance(save_name, str):
@@ -628,7 +633,9 @@ class VisualSettingsConfiguration(VisualColorBarConfiguration):
 		plt.close(
 			fig)
 
+	@instrument_stage("save-animation")
 	def display_animation(self, anim, fps=None, save_name=None, space_replacement=None, extension=None):
+		import matplotlib.pyplot as plt
 		if save_name is None:
 			plt.show()
 		elif isinstance(save_name, str):
@@ -643,5 +650,135 @@ class VisualSettingsConfiguration(VisualColorBarConfiguration):
 		else:
 			raise ValueError("invalid type(savename): {}".format(type(savename)))
 		plt.close()
-		
+
+	@staticmethod
+	def get_value_by_extension(value, extension):
+		if isinstance(value, dict):
+			modified_value = value.get(
+				extension,
+				None)
+		else:
+			modified_value = value
+		return modified_value
+
+	@instrument_stage("stream-animation")
+	def stream_animation(self, fig, animate, frames, save_name, fps, fargs=(), initialize_animation=None, is_blit=False, space_replacement=None, extension=None, codec=None, crf=None, pixel_format=None):
+		## draws every frame once into a reused Agg buffer and pipes the raw bytes into one long-lived
+		## ffmpeg process per extension; codec, crf and pixel_format may be dicts keyed by extension
+		import matplotlib.pyplot as plt
+		from matplotlib.backends.backend_agg import FigureCanvasAgg
+		if not isinstance(save_name, str):
+			raise ValueError("invalid type(save_name): {}".format(type(save_name)))
+		if not isinstance(is_blit, bool):
+			raise ValueError("invalid type(is_blit): {}".format(type(is_blit)))
+		if is_blit and (initialize_animation is None):
+			raise ValueError("initialize_animation is required to blit")
+		if extension is None:
+			modified_extensions = [".mp4"]
+		elif isinstance(extension, str):
+			modified_extensions = [extension]
+		elif isinstance(extension, (tuple, list)):
+			modified_extensions = list(
+				extension)
+		else:
+			raise ValueError("invalid type(extension): {}".format(type(extension)))
+		start_time = time.perf_counter()
+		canvas = FigureCanvasAgg(
+			fig)
+		if is_blit:
+			moving_handles = initialize_animation()
+			for moving_handle in moving_handles:
+				moving_handle.set_animated(
+					True)
+			canvas.draw()
+			background = canvas.copy_from_bbox(
+				fig.bbox)
+		else:
+			if initialize_animation is not None:
+				initialize_animation()
+			canvas.draw()
+		width, height = canvas.get_width_height(
+			physical=True)
+		encoders = list()
+		## drawing and encoding are timed separately; a slow encoder shows up as time spent writing frames
+		setup_duration = None
+		draw_duration = 0.0
+		encode_duration = 0.0
+		number_frames = 0
+		## every encoder is finalized and the figure closed even if drawing or encoding fails;
+		## the first error is raised only after all of that cleanup
+		errors = list()
+		try:
+			for modified_extension in modified_extensions:
+				save_path = self.get_save_path(
+					save_name=save_name,
+					default_extension=".mp4",
+					extension=modified_extension,
+					space_replacement=space_replacement)
+				encoder = FrameEncoderConfiguration()
+				encoder.initialize(
+					save_path=save_path,
+					width=width,
+					height=height,
+					fps=fps,
+					extension=modified_extension,
+					codec=self.get_value_by_extension(
+						value=codec,
+						extension=modified_extension),
+					crf=self.get_value_by_extension(
+						value=crf,
+						extension=modified_extension),
+					pixel_format=self.get_value_by_extension(
+						value=pixel_format,
+						extension=modified_extension))
+				encoders.append(
+					encoder)
+			setup_duration = time.perf_counter() - start_time
+			for frame in frames:
+				frame_start_time = time.perf_counter()
+				if is_blit:
+					canvas.restore_region(
+						background)
+					moving_handles = animate(
+						frame,
+						*fargs)
+					for moving_handle in moving_handles:
+						moving_handle.axes.draw_artist(
+							moving_handle)
+				else:
+					animate(
+						frame,
+						*fargs)
+					canvas.draw()
+				frame_buffer = canvas.buffer_rgba()
+				encode_start_time = time.perf_counter()
+				for encoder in encoders:
+					encoder.write_frame(
+						frame_buffer)
+				draw_duration += encode_start_time - frame_start_time
+				encode_duration += time.perf_counter() - encode_start_time
+				number_frames += 1
+		except BaseException as error:
+			errors.append(
+				error)
+		finalize_start_time = time.perf_counter()
+		for encoder in encoders:
+			try:
+				encoder.finalize()
+			except Exception as error:
+				errors.append(
+					error)
+		encode_duration += time.perf_counter() - finalize_start_time
+		plt.close(
+			fig)
+		update_stage_counts(
+			counts={
+				"number-frames" : number_frames,
+				"number-encoders" : len(encoders),
+				"setup-duration" : setup_duration,
+				"draw-duration" : draw_duration,
+				"encode-duration" : encode_duration})
+		if len(errors) > 0:
+			raise errors[0]
+
 ##
\ No newline at end of file